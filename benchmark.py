@@ -0,0 +1,432 @@
+"""
+Benchmarks of the simulation engine.
+
+every benchmark runs on fixed seeds and reports the best of several repeats. the results are saved as JSON, so the
+files of two commits can be compared with --compare.
+
+usage:
+    python benchmark.py [--output results.json] [--repeats 5]
+    python benchmark.py --compare old_results.json new_results.json
+    python benchmark.py --check-replay
+    python benchmark.py --check-ratings
+    python benchmark.py --check-timings
+"""
+import json
+import platform
+from argparse import ArgumentParser
+from contextlib import redirect_stdout
+from random import Random
+from io import StringIO
+from os import path as os_path
+from subprocess import run, DEVNULL
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Callable, Dict, List
+
+from numpy import int64
+from numpy.random import default_rng
+from pandas import DataFrame
+
+from constants import Color, NUM_OF_PLAYERS_IN_TEAM, COLORS, TEAMS, POINTS_FOR_WIN
+from data import random_gaussian_number, table_to_binary, PLAYER_DTYPE, update_league_table
+from coach_logic import ManagerGame
+from events_class import BinaryEventSink, ListSink
+from game_class import Game
+from leaderboard_class import Leaderboard
+from player_class import Player
+from rating_logic import rate, raw_scores, standardize, NORMALIZATION, SCORE_NAMES
+from replay_logic import replay_file, replay_matches
+from roster_class import RosterRepository
+from rng_logic import MatchRandom
+from standings_class import Standings
+from star_player_logic import MainPlayerGame
+from stats_class import StatsStore, STAT_NAMES, STAT_INDEX
+from team_class import Team
+from timing_class import StageTimer, GAME_STAGES
+from world_class import World
+
+SEED = 2024
+ATTRIBUTE_NAMES = ["speed", "agility", "creating", "shooting", "stability", "distribution", "control", "stamina"]
+
+
+def synthetic_records(num_of_players: int, seed: int = SEED) -> List[dict]:
+    """roster rows with the same attribute distribution as data.create_players, without the names package."""
+    rng = default_rng(seed)
+    records = []
+    for i in range(num_of_players):
+        team_index = (i // NUM_OF_PLAYERS_IN_TEAM) % len(TEAMS)
+        record = {"ID": i, "Name": f"Player {i}", "Team": TEAMS[team_index], "Color": COLORS[team_index],
+                  "Shirt number": i % NUM_OF_PLAYERS_IN_TEAM + 1}
+        record.update({name: random_gaussian_number(65, 15, 0, 100, rng) for name in ATTRIBUTE_NAMES})
+        records.append(record)
+    return records
+
+
+def build_teams(seed: int = SEED):
+    """builds two teams of synthetic players in a world of their own."""
+    world = World()
+    player_ids = [Player(record, world).get_id for record in synthetic_records(NUM_OF_PLAYERS_IN_TEAM * 2, seed)]
+    return Team("Left", Color.RED, player_ids[:NUM_OF_PLAYERS_IN_TEAM], world), \
+        Team("Right", Color.BLUE, player_ids[NUM_OF_PLAYERS_IN_TEAM:], world)
+
+
+def measure(function: Callable[[], int], repeats: int) -> dict:
+    """
+    runs function repeats times. function returns the number of operations it performed.
+
+    :return: dict of the best run's seconds, its operations and operations per second
+    """
+    best = None
+    for _ in range(repeats):
+        start = perf_counter()
+        operations = function()
+        seconds = perf_counter() - start
+        if best is None or seconds / operations < best["seconds"] / best["operations"]:
+            best = {"seconds": seconds, "operations": operations}
+    best["ops_per_sec"] = best["operations"] / best["seconds"]
+    return best
+
+
+def bench_matches(repeats: int, num_of_matches: int = 20) -> dict:
+    left_team, right_team = build_teams()
+
+    def run_matches():
+        for seed in range(num_of_matches):
+            left_team.reset_roster()
+            right_team.reset_roster()
+            Game(left_team, right_team, headless=True, rng=MatchRandom(seed)).simulate()
+        return num_of_matches
+    return measure(run_matches, repeats)
+
+
+def bench_turns(repeats: int, num_of_turns: int = 500) -> dict:
+    left_team, right_team = build_teams()
+
+    def run_turns():
+        left_team.reset_roster()
+        right_team.reset_roster()
+        game = Game(left_team, right_team, headless=True, rng=MatchRandom(SEED))
+        game._prepare_match()
+        seconds = 0
+        for _ in range(num_of_turns):
+            for team in game.teams:
+                team.reset_all_positions()
+            game._creating_competition()
+            start = perf_counter()
+            game._turn()
+            seconds += perf_counter() - start
+        return num_of_turns, seconds
+
+    best = None
+    for _ in range(repeats):
+        operations, seconds = run_turns()
+        if best is None or seconds < best["seconds"]:
+            best = {"seconds": seconds, "operations": operations, "ops_per_sec": operations / seconds}
+    return best
+
+
+def bench_player_construction(repeats: int, num_of_players: int = 2000) -> dict:
+    records = synthetic_records(num_of_players)
+
+    def construct():
+        world = World()
+        for record in records:
+            Player(record, world)
+        return num_of_players
+    return measure(construct, repeats)
+
+
+def bench_roster_loading(repeats: int, num_of_players: int = 2000) -> Dict[str, dict]:
+    results = {}
+    table = DataFrame(synthetic_records(num_of_players))
+    with TemporaryDirectory() as directory:
+        paths = {"binary": os_path.join(directory, "players.npy")}
+        table_to_binary(table, PLAYER_DTYPE, paths["binary"])
+        try:
+            paths["workbook"] = os_path.join(directory, "players.xlsx")
+            table.to_excel(paths["workbook"], index=False)
+        except ImportError:
+            del paths["workbook"]  # no Excel writer installed
+        for file_format, file_path in paths.items():
+            def load():
+                RosterRepository(file_path).records
+                return 1
+            results[f"roster_loading_{file_format}"] = measure(load, repeats)
+    return results
+
+
+def bench_increment_stat(repeats: int, num_of_increments: int = 100000) -> dict:
+    player = Player(synthetic_records(1)[0])
+    stats = ["distance_covered", "evasions", "hits_taken", "successful_shots"]
+
+    def increment():
+        for i in range(num_of_increments):
+            player.increment_stat_by(stats[i % 4], 1)
+        return num_of_increments
+    return measure(increment, repeats)
+
+
+def bench_match_conclusion(repeats: int) -> Dict[str, dict]:
+    left_team, right_team = build_teams()
+    game = Game(left_team, right_team, rng=MatchRandom(SEED))
+    with redirect_stdout(StringIO()):
+        # played without simulate(), whose roll up would zero the match counters before they are concluded
+        game._prepare_match()
+        while max(game.scores) < POINTS_FOR_WIN:
+            game.set()
+    players = left_team.roster + right_team.roster
+
+    def conclude():
+        with redirect_stdout(StringIO()):
+            game._conclude_match()
+        return 1
+
+    def top_summaries():
+        game.get_top_summary()
+        return len(players)
+    return {"conclude_match": measure(conclude, repeats),
+            "top_summary": measure(top_summaries, repeats)}
+
+
+def bench_league_updates(repeats: int, num_of_results: int = 500) -> Dict[str, dict]:
+    rng = default_rng(SEED)
+    num_of_teams = len(TEAMS)
+    fixtures = [(int(left), int((left + 1 + offset) % num_of_teams), 10, int(score)) for left, offset, score in
+                zip(rng.integers(0, num_of_teams, num_of_results), rng.integers(0, num_of_teams - 1, num_of_results),
+                    rng.integers(0, 10, num_of_results))]
+
+    def table_updates():
+        table = DataFrame({"ID": list(range(num_of_teams)), "Color": COLORS, "Name": TEAMS,
+                           "touchdowns": 0, "conceded": 0, "ratio": 0, "points": 0})
+        for left, right, left_score, right_score in fixtures:
+            update_league_table(TEAMS[left], TEAMS[right], {"left score": left_score, "right score": right_score},
+                                table)
+        return num_of_results
+
+    def standings_updates():
+        standings = Standings()
+        for team_id, name in enumerate(TEAMS):
+            standings.add_team(team_id, name, COLORS[team_id])
+        for left, right, left_score, right_score in fixtures:
+            standings.record_match(left, right, left_score, right_score)
+        return num_of_results
+    return {"update_league_table": measure(table_updates, repeats),
+            "standings_record_match": measure(standings_updates, repeats)}
+
+
+def bench_event_replay(repeats: int, num_of_matches: int = 20) -> dict:
+    left_team, right_team = build_teams()
+    with TemporaryDirectory() as directory:
+        events_path = os_path.join(directory, "events.bin")
+        with BinaryEventSink(events_path) as sink:
+            for seed in range(num_of_matches):
+                left_team.reset_roster()
+                right_team.reset_roster()
+                Game(left_team, right_team, headless=True, rng=MatchRandom(seed), event_sink=sink).simulate()
+
+        def replay():
+            return sum(1 for _ in replay_file(events_path))
+        return measure(replay, repeats)
+
+
+def check_event_replay(num_of_matches: int = 10) -> int:
+    """
+    plays seeded matches of every game type with random answers to their decisions, and checks that replaying
+    each match's event stream gives the score, stats and ratings of the live match summary.
+
+    :return: the number of matches checked
+    """
+    left_team, right_team = build_teams()
+    checked = 0
+    for game_type in (Game, ManagerGame, MainPlayerGame):
+        for seed in range(num_of_matches):
+            left_team.reset_roster()
+            right_team.reset_roster()
+            sink = ListSink()
+            chooser = Random(seed)
+            summary = game_type(left_team, right_team, headless=True, rng=MatchRandom(seed), event_sink=sink
+                                ).simulate(answer=lambda request: chooser.choice(request.options))
+            replays = list(replay_matches(sink.events))
+            idle = dict.fromkeys(STAT_NAMES, 0)  # a replay leaves out the players that never appear in the stream
+            if len(replays) != 1 or (replays[0].left_score, replays[0].right_score) != \
+                    (summary["left score"], summary["right score"]) or \
+                    any(replays[0].stats.get(player_id, idle) != stats
+                        for player_id, stats in summary["players"].items()) or \
+                    replays[0].ratings != summary["ratings"]:
+                print(f"the replay of a {game_type.__name__} with seed {seed} does not match its live summary")
+                raise ValueError(f"{game_type.__name__} replay mismatch")
+            checked += 1
+    return checked
+
+
+def check_stage_timings(num_of_matches: int = 3) -> int:
+    """
+    plays timed matches of every game type with random answers to their decisions, and checks that every stage of
+    GAME_STAGES got time in each of them.
+
+    :return: the number of matches checked
+    """
+    left_team, right_team = build_teams()
+    stages = set(GAME_STAGES.values())
+    checked = 0
+    for game_type in (Game, ManagerGame, MainPlayerGame):
+        for seed in range(num_of_matches):
+            left_team.reset_roster()
+            right_team.reset_roster()
+            timer = StageTimer()
+            chooser = Random(seed)
+            game_type(left_team, right_team, headless=True, rng=MatchRandom(seed), timer=timer
+                      ).simulate(answer=lambda request: chooser.choice(request.options))
+            missing = stages - set(timer.report())
+            if missing:
+                print(f"a timed {game_type.__name__} with seed {seed} reported no time for {sorted(missing)}")
+                raise ValueError(f"{game_type.__name__} stages missing")
+            checked += 1
+    return checked
+
+
+def _baseline_scores(row) -> dict:
+    """the per-player rating formulas as they were before rating_logic, over one row of numpy counters."""
+    def score(categories, weights):
+        return sum([row[STAT_INDEX[categories[i]]] * weights[i] for i in range(len(categories))])
+
+    offence_scores = [score(["touchdowns", "assists"], [1, 0.8]),
+                      score(["distance_carried", "distance_passed", "advancement_by_catch"], [1, 1, 1]),
+                      score(["creations", "end_zone_creation"], [1, 2]),
+                      score(["carrier_evasions", "drop_avoidance"], [10, 1])]
+    fail_scores = [score(["drops_made", "failed_passes", "failed_catches"], [1, 0.4, 0.2]),
+                   score(["hits_taken", "balance_losses"], [0.2, 1])]
+    formation_scores = [score(["distance_covered", "turns_in_touchdown_strip", "evasions", "fall_avoidance"],
+                              [0.25, 1, 0.25, 0.05]),
+                        score(["successful_shots", "successful_takedowns"], [0.2, 1])]
+    return {"off": round(sum([offence_scores[i] * [1, 0.05, 0.2, 0.005][i] for i in range(4)]), 2),
+            "def": round(score(["last_ditch_hits", "last_ditch_takedowns", "carrier_takedowns", "carrier_hits"],
+                               [0.5, 1, 0.5, 0.2]), 2),
+            "form": round(sum([formation_scores[i] * [0.1, 0.2][i] for i in range(2)]), 2),
+            "fail": round(sum([fail_scores[i] * [1, 0.2][i] for i in range(2)]), 2)}
+
+
+def check_ratings(num_of_rows: int = 3000) -> int:
+    """
+    checks raw_scores and standardize against the per-player formulas they replaced, on random int64 counters.
+
+    :return: the number of rows checked
+    """
+    rng = default_rng(SEED)
+    stats = rng.integers(0, rng.integers(1, 400, len(STAT_NAMES)), (num_of_rows, len(STAT_NAMES)), dtype=int64)
+    scores = raw_scores(stats)
+    standardized = standardize(scores, NORMALIZATION)
+    for i, row in enumerate(stats):
+        for name, raw in _baseline_scores(row).items():
+            mean, std = NORMALIZATION[name]
+            expected = min(max(round(5.5 + (raw - mean) / std * 1.5, 1), 1.0), 10.0)
+            if scores[name][i] != raw or standardized[name][i] != expected:
+                print(f"the {name} score of row {i} is {scores[name][i]} ({standardized[name][i]}), "
+                      f"the per-player formula gives {raw} ({expected})")
+                raise ValueError(f"{name} rating mismatch")
+    return num_of_rows * len(SCORE_NAMES)
+
+
+def bench_leaderboards(repeats: int, num_of_players: int = 100000, num_of_merges: int = 200) -> Dict[str, dict]:
+    rng = default_rng(SEED)
+    store = StatsStore(num_of_players)
+    store.values[:] = rng.integers(0, 50, store.values.shape)
+    leaderboard = Leaderboard(store)
+    merges = [(rng.choice(num_of_players, NUM_OF_PLAYERS_IN_TEAM * 2, replace=False),
+               rng.integers(0, 10, (NUM_OF_PLAYERS_IN_TEAM * 2, len(STAT_NAMES)))) for _ in range(num_of_merges)]
+
+    def merge_matches():
+        for player_ids, rows in merges:
+            store.add_rows(player_ids, rows)
+        return num_of_merges
+
+    def read_leaders():
+        for _ in range(num_of_merges):
+            leaderboard.leaders()
+        return num_of_merges
+    return {"leaderboard_match_merges": measure(merge_matches, repeats),
+            "leaderboard_reads": measure(read_leaders, repeats)}
+
+
+def bench_ratings(repeats: int, num_of_players: int = 10000) -> dict:
+    stats = default_rng(SEED).integers(0, 50, (num_of_players, len(STAT_NAMES)))
+
+    def rate_players():
+        rate(stats)
+        return num_of_players
+    return measure(rate_players, repeats)
+
+
+def git_commit() -> str:
+    try:
+        result = run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, stdin=DEVNULL,
+                     cwd=os_path.dirname(os_path.abspath(__file__)))
+        return result.stdout.strip()
+    except OSError:
+        return ""
+
+
+def run_all(repeats: int = 5) -> dict:
+    results = {
+        "matches": bench_matches(repeats),
+        "turns": bench_turns(repeats),
+        "player_construction": bench_player_construction(repeats),
+        "increment_stat_by": bench_increment_stat(repeats),
+        "event_replay_matches": bench_event_replay(repeats)
+    }
+    results.update(bench_roster_loading(repeats))
+    results.update(bench_match_conclusion(repeats))
+    results.update(bench_league_updates(repeats))
+    results.update(bench_leaderboards(repeats))
+    results["player_ratings"] = bench_ratings(repeats)
+    return {"commit": git_commit(), "python": platform.python_version(), "seed": SEED, "results": results}
+
+
+def compare(old_path: str, new_path: str):
+    with open(old_path) as file:
+        old = json.load(file)
+    with open(new_path) as file:
+        new = json.load(file)
+    print(f"{'benchmark':<26}{old['commit'] or 'old':>14}{new['commit'] or 'new':>14}   change")
+    for name, new_result in new["results"].items():
+        if name not in old["results"]:
+            print(f"{name:<26}{'-':>14}{new_result['ops_per_sec']:>14.1f}")
+            continue
+        old_rate = old["results"][name]["ops_per_sec"]
+        change = (new_result["ops_per_sec"] / old_rate - 1) * 100
+        print(f"{name:<26}{old_rate:>14.1f}{new_result['ops_per_sec']:>14.1f}   {change:+.1f}%")
+
+
+def main():
+    parser = ArgumentParser(description="benchmarks of the simulation engine")
+    parser.add_argument("--output", default="bench_output.json", help="file to save the results to")
+    parser.add_argument("--repeats", type=int, default=5, help="runs of every benchmark, the best one is kept")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two saved result files")
+    parser.add_argument("--check-replay", action="store_true",
+                        help="check that the event replay of every game type matches its live summary")
+    parser.add_argument("--check-ratings", action="store_true",
+                        help="check the vectorized ratings against the per-player formulas they replaced")
+    parser.add_argument("--check-timings", action="store_true",
+                        help="check that a timed match of every game type times all of its stages")
+    args = parser.parse_args()
+    if args.compare:
+        compare(*args.compare)
+        return
+    if args.check_timings:
+        print(f"{check_stage_timings()} timed matches report every stage")
+        return
+    if args.check_ratings:
+        print(f"{check_ratings()} ratings match the per-player formulas")
+        return
+    if args.check_replay:
+        print(f"{check_event_replay()} match replays match their live summaries")
+        return
+    report = run_all(args.repeats)
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    for name, result in report["results"].items():
+        print(f"{name:<26}{result['ops_per_sec']:>14.1f} ops/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Calibration of the rating normalization.
+
+runs a batch of headless matches across a process pool and measures the raw offence, defence, formation and fail
+scores of every player that played a set, the way assess_performance rates them. the distributions are kept as
+running moments, so no raw score is held in memory. the result is written as the profile rating_logic loads.
+
+usage:
+    python calibration_logic.py [--matches 10000] [--seed 1] [--workers 4] [--output rating_profile.json]
+"""
+import json
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime, timezone
+from os import cpu_count
+from typing import List, Union
+
+from numpy import zeros, float64, int64, column_stack
+from numpy.random import SeedSequence
+
+from constants import Color, COLORS, TEAMS, NUM_OF_TEAMS, NUM_OF_PLAYERS_IN_TEAM, RATING_PROFILE_PATH
+from player_class import Player
+from predictor_logic import init_worker, snapshot_team, simulate_match
+from rating_logic import SCORE_NAMES, raw_scores
+from rng_logic import spawn_seeds
+from season_logic import round_robin_schedule, Fixture
+from stats_class import STAT_NAMES
+from team_class import Team
+from world_class import World, resolve_world
+
+
+class RunningMoments:
+    """
+    Count, mean and sum of squared deviations of every score, updated a batch at a time.
+
+    a batch is folded in with Chan's parallel form of Welford's update, which also merges the moments of two
+    separate runs, so memory does not grow with the number of scores seen.
+    """
+
+    def __init__(self, width: int = len(SCORE_NAMES)):
+        self._count = 0
+        self._mean = zeros(width, dtype=float64)
+        self._m2 = zeros(width, dtype=float64)
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def mean(self):
+        return self._mean.copy()
+
+    @property
+    def variance(self):
+        """the sample variance, 0 before there are two samples."""
+        if self._count < 2:
+            return zeros(len(self._mean), dtype=float64)
+        return self._m2 / (self._count - 1)
+
+    @property
+    def std(self):
+        return self.variance ** 0.5
+
+    def _combine(self, count: int, mean, m2):
+        if not count:
+            return
+        total = self._count + count
+        delta = mean - self._mean
+        self._mean = self._mean + delta * (count / total)
+        self._m2 = self._m2 + m2 + delta ** 2 * (self._count * count / total)
+        self._count = total
+
+    def update(self, batch):
+        """:param batch: array of shape (samples, width)"""
+        if not len(batch):
+            return
+        mean = batch.mean(axis=0)
+        self._combine(len(batch), mean, ((batch - mean) ** 2).sum(axis=0))
+
+    def merge(self, other: "RunningMoments"):
+        self._combine(other._count, other._mean, other._m2)
+
+
+def _league_fixtures(num_of_teams: int, num_of_matches: int) -> List[Fixture]:
+    """:return: the round-robin fixtures of num_of_teams, repeated until there are num_of_matches"""
+    fixtures = [fixture for fixtures in round_robin_schedule(num_of_teams, legs=2) for fixture in fixtures]
+    return [fixtures[i % len(fixtures)] for i in range(num_of_matches)]
+
+
+def calibration_chunk(snapshots: List[dict], fixtures: List[Fixture], seed_sequence: SeedSequence
+                      ) -> RunningMoments:
+    """
+    runs the given fixtures in a worker, every match on its own random stream spawned from seed_sequence.
+
+    :return: the moments of the raw scores of every player that played a set
+    """
+    moments = RunningMoments()
+    for (left, right), match_seed in zip(fixtures, spawn_seeds(seed_sequence, len(fixtures))):
+        summary = simulate_match(snapshots[left], snapshots[right], match_seed)
+        rows = [[stats[stat] for stat in STAT_NAMES] for stats in summary["players"].values() if stats["sets_played"]]
+        scores = raw_scores(zeros((0, len(STAT_NAMES)), dtype=int64) if not rows else rows)
+        moments.update(column_stack([scores[name] for name in SCORE_NAMES]))
+    return moments
+
+
+def calibrate(teams: List[Team], num_of_matches: int, chunk_size: int = 50, seed: Union[int, None] = None,
+              workers: Union[int, None] = None) -> RunningMoments:
+    """
+    simulates num_of_matches headless matches between the teams, in chunks across a process pool.
+
+    every chunk runs on its own random stream spawned from seed, so a seeded calibration is repeatable. at most two
+    chunks per worker are in flight.
+
+    :return: the moments of the raw scores, one column per score in SCORE_NAMES order
+    """
+    if chunk_size < 1:
+        print(f"chunk_size must be at least 1, got {chunk_size}")
+        raise ValueError(chunk_size)
+    if len(teams) < 2:
+        print(f"calibrating needs at least 2 teams to play each other, got {len(teams)}")
+        raise ValueError(len(teams))
+    snapshots = [snapshot_team(team) for team in teams]
+    fixtures = _league_fixtures(len(teams), num_of_matches)
+    chunks = [fixtures[i:i + chunk_size] for i in range(0, num_of_matches, chunk_size)]
+    seed_sequences = spawn_seeds(seed, len(chunks))
+    workers = workers or cpu_count() or 1
+
+    moments = RunningMoments()
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+        pending = set()
+        next_chunk = 0
+        while next_chunk < len(chunks) or pending:
+            while next_chunk < len(chunks) and len(pending) < workers * 2:
+                pending.add(executor.submit(calibration_chunk, snapshots, chunks[next_chunk],
+                                            seed_sequences[next_chunk]))
+                next_chunk += 1
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                moments.merge(future.result())
+    return moments
+
+
+def build_profile(moments: RunningMoments, num_of_matches: int) -> dict:
+    means = moments.mean.tolist()
+    stds = moments.std.tolist()
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "matches": num_of_matches,
+        "player_matches": moments.count,
+        "scores": {name: {"mean": round(mean, 4), "std": round(std, 4)}
+                   for name, mean, std in zip(SCORE_NAMES, means, stds)}
+    }
+
+
+def write_profile(profile: dict, path: str = RATING_PROFILE_PATH):
+    with open(path, "w") as file:
+        json.dump(profile, file, indent=2)
+
+
+def build_league_teams(world: Union[World, None] = None) -> List[Team]:
+    """builds the league's teams out of the default roster, in world (the default one when None)."""
+    world = resolve_world(world)
+    player_ids = [Player(world=world).get_id for _ in range(NUM_OF_TEAMS * NUM_OF_PLAYERS_IN_TEAM)]
+    return [Team(TEAMS[i], Color[COLORS[i].upper()],
+                 player_ids[i * NUM_OF_PLAYERS_IN_TEAM:(i + 1) * NUM_OF_PLAYERS_IN_TEAM], world)
+            for i in range(NUM_OF_TEAMS)]
+
+
+def main():
+    parser = ArgumentParser(description="calibrates the normalization of the player ratings")
+    parser.add_argument("--matches", type=int, default=10000, help="number of matches to simulate")
+    parser.add_argument("--chunk-size", type=int, default=50, help="matches per worker task")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the matches' random streams")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, one per core by default")
+    parser.add_argument("--output", default=RATING_PROFILE_PATH, help="file to write the profile to")
+    args = parser.parse_args()
+    moments = calibrate(build_league_teams(), args.matches, args.chunk_size, args.seed, args.workers)
+    profile = build_profile(moments, args.matches)
+    write_profile(profile, args.output)
+    for name, values in profile["scores"].items():
+        print(f"{name:<6}mean {values['mean']:>8.3f}   std {values['std']:>8.3f}")
+    print(f"{profile['player_matches']} player matches written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
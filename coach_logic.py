@@ -1,70 +1,83 @@
-from star_player_logic import validate_answer
 from team_class import Team
 from player_class import Player
 from game_class import Game
+from rng_logic import MatchRandom
+from timing_class import StageTimer
+from decision_class import DecisionKind, ask
 from constants import Color, NUM_OF_PLAYERS_IN_LINE_UP, NUM_OF_PLAYERS_IN_TEAM
+from typing import Union
 
 
 class ManagerGame(Game):
-    def __init__(self, left_team: Team, right_team: Team):
-        super().__init__(left_team, right_team)
-        self.main_team = self.decide_main_team()
+    def __init__(self, left_team: Team, right_team: Team, headless: bool = False, rng: MatchRandom = None,
+                 timer: StageTimer = None, event_sink=None, main_team: Team = None):
+        """
+        :param main_team: the team a human manages, asked for when the match starts when None
+        """
+        super().__init__(left_team, right_team, headless, rng, timer, event_sink)
+        self.main_team: Union[Team, None] = main_team
 
-    def _prepare_match(self):
-        self._left_team.is_left = True
-        self._right_team.is_left = False
-        self._set_counter = 0
-        self.choose_line_up()
+    def _prepare_steps(self):
+        if self.main_team is None:
+            self.main_team = yield from self._decide_main_team_steps()
+        self._reset_match_state()
+        yield from self._line_up_steps()
         for team in self.teams:
             team.reset_all_positions()
             team.inhibit_substitution()
         self._declare_teams()
 
-    def decide_main_team(self):
+    def _decide_main_team_steps(self):
         team_ids = [team.team_id for team in self.teams]
-        chosen_team_id = validate_answer(f"choose team. use id's from the following list: {team_ids}", team_ids)
+        chosen_team_id = yield from ask(DecisionKind.TEAM,
+                                        f"choose team. use id's from the following list: {team_ids}", team_ids)
         for team in self.teams:
             if team.team_id == chosen_team_id:
                 return team
         raise Exception()
 
-    def choose_line_up(self):
+    def _line_up_steps(self):
         options = self.main_team.default_starting_roster_ids[:]
         new_roster_ids = []
-        for player in self.main_team.roster:
-            player.present_player_attributes()
-        if not bool(validate_answer("would you like to change line up? \nif so, press 1, otherwise 0", [0, 1])):
+        if not self._headless:
+            for player in self.main_team.roster:
+                player.present_player_attributes()
+        if not (yield from ask(DecisionKind.LINE_UP, "would you like to change line up? \nif so, press 1, otherwise 0",
+                               [0, 1])):
             return
 
         for position in range(NUM_OF_PLAYERS_IN_LINE_UP):
-            chosen_id = validate_answer(f"choose player for position {position}", options)
+            chosen_id = yield from ask(DecisionKind.LINE_UP, f"choose player for position {position}", options)
             options.remove(chosen_id)
             new_roster_ids.append(chosen_id)
         new_roster_ids.extend(options)
         self.main_team.update_default_roster_to_given_id_list(new_roster_ids)
         self.main_team.reset_roster()
-        self.main_team.display_roster()
+        if not self._headless:
+            self.main_team.display_roster()
 
-    def coach_substitution(self):
+    def _coach_substitution_steps(self):
         if not self.main_team.can_substitute:
             return
-        if bool(validate_answer("would you like to make a substitution? if so press 1, otherwise 0", [0, 1])):
+        if (yield from ask(DecisionKind.SUBSTITUTION,
+                           "would you like to make a substitution? if so press 1, otherwise 0", [0, 1])):
             exit_options = [num for num in range(NUM_OF_PLAYERS_IN_LINE_UP)]
             enter_options = [num for num in range(NUM_OF_PLAYERS_IN_LINE_UP, NUM_OF_PLAYERS_IN_TEAM)]
-            exiting_player = self.main_team.line_up[validate_answer(f"choose player to sub out", exit_options)]
-            entering_player = self.main_team.roster[validate_answer(f"choose player to sub in", enter_options)]
+            exiting_player = self.main_team.line_up[
+                (yield from ask(DecisionKind.SUBSTITUTION, "choose player to sub out", exit_options))]
+            entering_player = self.main_team.roster[
+                (yield from ask(DecisionKind.SUBSTITUTION, "choose player to sub in", enter_options))]
             self.main_team.substitute(entering_player, exiting_player)
-            print(f"{entering_player.format_name} came on for {exiting_player.format_name} at position "
-                  f"{exiting_player.position}")
+            self._announce_substitution(entering_player, exiting_player)
             self.main_team.inhibit_substitution()
 
-    def set(self):
-        self._set_counter += 1
+    def _set_steps(self):
+        self._start_set()
         for team in self.teams:
             if team is self.main_team and team.can_substitute:
-                self.coach_substitution()
+                yield from self._coach_substitution_steps()
             elif team.can_substitute:
-                team.decide_substitution()
+                self._announce_substitution(*team.decide_substitution(self._rng))
 
             team.reset_all_positions()
             team.add_set_to_players_count()
@@ -72,11 +85,13 @@ class ManagerGame(Game):
         self._phase()
 
 
-for i in range(NUM_OF_PLAYERS_IN_TEAM*2):
-    Player()
+def main():
+    """plays a managed match between the first two teams of the default roster."""
+    player_ids = [Player().get_id for _ in range(NUM_OF_PLAYERS_IN_TEAM * 2)]
+    team1 = Team("A", Color.RED, player_ids[:NUM_OF_PLAYERS_IN_TEAM])
+    team2 = Team("B", Color.BLUE, player_ids[NUM_OF_PLAYERS_IN_TEAM:])
+    ManagerGame(team1, team2).simulate()
 
-team1 = Team("A", Color.RED, list(range(NUM_OF_PLAYERS_IN_TEAM)))
-team2 = Team("B", Color.BLUE, list(range(NUM_OF_PLAYERS_IN_TEAM, NUM_OF_PLAYERS_IN_TEAM * 2)))
-game1 = ManagerGame(team1, team2)
-game2 = Game(team1, team2)
-game1.simulate()
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 from enum import Enum
+from os import environ
+from os.path import splitext, join, dirname, abspath
 
 
 class Color(Enum):  # TODO: use it in code
@@ -23,9 +25,18 @@ class Color(Enum):  # TODO: use it in code
 NUM_OF_PLAYERS_IN_TEAM = 8
 NUM_OF_PLAYERS_IN_LINE_UP = 5
 NUM_OF_TEAMS = 8
+NUM_OF_ROWS = NUM_OF_PLAYERS_IN_LINE_UP * 2
+NUM_OF_COLUMNS = 22
 POINTS_FOR_WIN = 10
-PLAYERS_PATH = r"C:\Users\gomea\PycharmProjects\disc_game_pandas\players_excel.xlsx"
-TEAMS_PATH = r"C:\Users\gomea\PycharmProjects\disc_game_pandas\teams_excel.xlsx"
+PLAYERS_PATH = environ.get("DISCBALL_PLAYERS_PATH",
+                          r"C:\Users\gomea\PycharmProjects\disc_game_pandas\players_excel.xlsx")
+TEAMS_PATH = environ.get("DISCBALL_TEAMS_PATH", r"C:\Users\gomea\PycharmProjects\disc_game_pandas\teams_excel.xlsx")
+# binary copies of the workbooks (see data.convert_workbooks_to_binary), either path may be given to the importers
+PLAYERS_BINARY_PATH = environ.get("DISCBALL_PLAYERS_BINARY_PATH", splitext(PLAYERS_PATH)[0] + ".npy")
+TEAMS_BINARY_PATH = environ.get("DISCBALL_TEAMS_BINARY_PATH", splitext(TEAMS_PATH)[0] + ".npy")
+# normalization of the player ratings written by calibration_logic, the hard-coded one is used while there is none
+RATING_PROFILE_PATH = environ.get("DISCBALL_RATING_PROFILE_PATH",
+                                  join(dirname(abspath(__file__)), "rating_profile.json"))
 
 
 COLOR_RESET = '\033[0m'
@@ -1,9 +1,17 @@
 from pandas import DataFrame, read_excel, Series
-from numpy import random, clip
-from names import get_first_name
+from numpy import clip, array, dtype, save, load
+from numpy.random import default_rng, Generator
 from constants import *
 
 
+PLAYER_DTYPE = dtype([
+    ("ID", "<i4"), ("Name", "<U24"), ("Team", "<U24"), ("Color", "<U16"), ("Shirt number", "<i2"),
+    ("speed", "u1"), ("agility", "u1"), ("creating", "u1"), ("shooting", "u1"),
+    ("stability", "u1"), ("distribution", "u1"), ("control", "u1"), ("stamina", "u1")
+])
+TEAM_DTYPE = dtype([("ID", "<i4"), ("Color", "<U16"), ("Name", "<U24")])
+
+
 # TODO: maybe use matplotlib to show graphics of statistics?
 def find_team_by_name(team_name: str) -> int:
     for index, team in enumerate(TEAMS):
@@ -24,8 +32,9 @@ def get_color(team_name: str) -> str:
 
 
 ###
-def random_gaussian_number(mean, std_dev, min_value, max_value) -> int:
-    return int(clip(round(random.normal(mean, std_dev)), min_value, max_value))
+def random_gaussian_number(mean, std_dev, min_value, max_value, rng: Generator = None) -> int:
+    rng = rng if rng is not None else default_rng()
+    return int(clip(round(rng.normal(mean, std_dev)), min_value, max_value))
 
 
 def create_league(path) -> DataFrame:
@@ -39,8 +48,38 @@ def create_league(path) -> DataFrame:
     return df
 
 
-def import_league():
-    df = read_excel(TEAMS_PATH)
+def is_binary_path(path: str) -> bool:
+    return path.lower().endswith(".npy")
+
+
+def table_to_binary(table: DataFrame, table_dtype: dtype, path: str):
+    """writes a players or teams table as a NumPy structured array (a .npy file)."""
+    records = array([tuple(row[name] for name in table_dtype.names) for row in table.to_dict("records")],
+                    dtype=table_dtype)
+    save(path, records)
+    return records
+
+
+def load_binary(path: str):
+    """loads a structured array written by table_to_binary, memory-mapped rather than read into memory."""
+    return load(path, mmap_mode="r")
+
+
+def convert_workbooks_to_binary(players_path=PLAYERS_PATH, teams_path=TEAMS_PATH,
+                                players_binary_path=PLAYERS_BINARY_PATH, teams_binary_path=TEAMS_BINARY_PATH):
+    """one-shot conversion of the players and teams workbooks to their binary copies."""
+    table_to_binary(read_excel(players_path), PLAYER_DTYPE, players_binary_path)
+    table_to_binary(read_excel(teams_path), TEAM_DTYPE, teams_binary_path)
+
+
+def _read_table(path: str) -> DataFrame:
+    if is_binary_path(path):
+        return DataFrame(load_binary(path))
+    return read_excel(path)
+
+
+def import_league(path=TEAMS_PATH):
+    df = _read_table(path)
     team_colors = [df.loc[i, "Color"] for i in range(NUM_OF_TEAMS)]
     league_dict = {
         "ID": list(df["ID"]),
@@ -97,7 +136,10 @@ def create_empty_stats_dict() -> DataFrame:
 
 
 ####
-def create_players(path) -> DataFrame:
+def create_players(path, seed=None) -> DataFrame:
+    """creates the players workbook. the attributes are drawn from a generator seeded with seed."""
+    from names import get_first_name  # only needed to make up new players
+    rng = default_rng(seed)
     total_num_of_players = NUM_OF_PLAYERS_IN_TEAM * NUM_OF_TEAMS
     player_ability_dict = {
         "ID": [i for i in range(total_num_of_players)],
@@ -105,14 +147,14 @@ def create_players(path) -> DataFrame:
         "Team": [TEAMS[i] for i in range(NUM_OF_TEAMS) for _ in range(NUM_OF_PLAYERS_IN_TEAM)],
         "Color": [COLORS[i] for i in range(NUM_OF_TEAMS) for _ in range(NUM_OF_PLAYERS_IN_TEAM)],
         "Shirt number": [i + 1 for _ in range(NUM_OF_TEAMS) for i in range(NUM_OF_PLAYERS_IN_TEAM)],
-        "speed": [random_gaussian_number(65, 15, 0, 100) for _ in range(total_num_of_players)],
-        "agility": [random_gaussian_number(65, 15, 0, 100) for _ in range(total_num_of_players)],
-        "creating": [random_gaussian_number(65, 15, 0, 100) for _ in range(total_num_of_players)],
-        "shooting": [random_gaussian_number(65, 15, 0, 100) for _ in range(total_num_of_players)],
-        "stability": [random_gaussian_number(65, 15, 0, 100) for _ in range(total_num_of_players)],
-        "distribution": [random_gaussian_number(65, 15, 0, 100) for _ in range(total_num_of_players)],
-        "control": [random_gaussian_number(65, 15, 0, 100) for _ in range(total_num_of_players)],
-        "stamina": [random_gaussian_number(65, 15, 0, 100) for _ in range(total_num_of_players)]
+        "speed": [random_gaussian_number(65, 15, 0, 100, rng) for _ in range(total_num_of_players)],
+        "agility": [random_gaussian_number(65, 15, 0, 100, rng) for _ in range(total_num_of_players)],
+        "creating": [random_gaussian_number(65, 15, 0, 100, rng) for _ in range(total_num_of_players)],
+        "shooting": [random_gaussian_number(65, 15, 0, 100, rng) for _ in range(total_num_of_players)],
+        "stability": [random_gaussian_number(65, 15, 0, 100, rng) for _ in range(total_num_of_players)],
+        "distribution": [random_gaussian_number(65, 15, 0, 100, rng) for _ in range(total_num_of_players)],
+        "control": [random_gaussian_number(65, 15, 0, 100, rng) for _ in range(total_num_of_players)],
+        "stamina": [random_gaussian_number(65, 15, 0, 100, rng) for _ in range(total_num_of_players)]
     }
     players_df = DataFrame(player_ability_dict)
     players_df.to_excel(path, index=False)
@@ -120,17 +162,23 @@ def create_players(path) -> DataFrame:
 
 
 ###
-def import_players():
-    return read_excel(PLAYERS_PATH)
+def import_players(path=PLAYERS_PATH):
+    return _read_table(path)
 
 
-def clear_table(table_name: DataFrame):
-    table_name.loc[:, :] = 0
+def import_player_records(path=PLAYERS_PATH) -> list:
+    """
+    :return: list of every player's row as a dict. a binary file is read without building a DataFrame
+    """
+    if is_binary_path(path):
+        records = load_binary(path)
+        names = records.dtype.names
+        return [dict(zip(names, row)) for row in records.tolist()]
+    return read_excel(path).to_dict("records")
 
 
-def update_stats_table_from_another(source_table: DataFrame, receiving_table: DataFrame):
-    source_table["ID"] = 0
-    return receiving_table + source_table
+def clear_table(table_name: DataFrame):
+    table_name.loc[:, :] = 0
 
 
 def update_averages(player_id: int, stats_table: DataFrame, is_season: bool):
@@ -0,0 +1,136 @@
+from enum import IntEnum
+from typing import Callable, Generator, List, NamedTuple, Union
+
+
+class DecisionKind(IntEnum):
+    TEAM = 0  # the team a human plays for, options: team ids
+    PLAYER = 1  # the star player a human controls, options: player ids
+    LINE_UP = 2  # whether to change the line up (0 or 1), then the player of every position, options: player ids
+    SUBSTITUTION = 3  # whether to substitute (0 or 1), then the line up index out and the roster index in
+    DASH_OR_PASS = 4  # 0 to dash, 1 to pass
+    PASS_TARGET = 5  # options: line up indexes
+    SHOOT_TARGET = 6  # options: line up indexes of the running team
+
+
+class DecisionRequest(NamedTuple):
+    """A decision a match is waiting for. the answer is one of options."""
+    kind: DecisionKind
+    prompt: str
+    options: list
+    error: str = ""  # why the previous answer to the same question was refused
+
+    def refuse(self) -> "DecisionRequest":
+        """:return: the same request, asked again after an answer that is not an option"""
+        return self._replace(error=f"that not an option.\nthe options are {self.options}. try again")
+
+
+# yields decisions (and None at a pause between stretches of play), gets answers sent back, returns a match summary
+Steps = Generator[Union[DecisionRequest, None], object, dict]
+
+
+def ask(kind: DecisionKind, prompt: str, options: List) -> Generator[DecisionRequest, object, object]:
+    """
+    asks for a decision until one of the options is sent back, use with yield from.
+
+    :return: the answer
+    """
+    request = DecisionRequest(kind, prompt, list(options))
+    while True:
+        answer = yield request
+        if answer in request.options:
+            return answer
+        request = request.refuse()
+
+
+def answer_in_console(request: DecisionRequest):
+    """reads the answer to a request from the keyboard."""
+    if request.error:
+        print(request.error)
+    print(request.prompt, end="", flush=True)  # through sys.stdout, so a FrameRenderer sees it (see WatchedStream)
+    try:
+        return int(input())
+    except ValueError:
+        return None
+
+
+def run_steps(steps: Steps, answer: Callable[[DecisionRequest], object] = answer_in_console) -> dict:
+    """
+    drives a match to its end, answering every decision with answer.
+
+    :return: the match summary
+    """
+    try:
+        request = next(steps)
+        while True:
+            request = steps.send(None if request is None else answer(request))
+    except StopIteration as stop:
+        return stop.value
+
+
+class MatchSteps:
+    """
+    A match played one decision at a time, by a caller that answers its decisions whenever it likes.
+
+    advance runs the match until it needs a decision and returns right away, so one thread (or one event loop) can
+    keep many paused matches. resume runs it only to the next pause between sets, for a caller that interleaves many
+    matches. the world's lock is held only while the match runs, not while it waits. a paused match lives in a
+    generator, so it can not be pickled or moved to another process.
+    """
+
+    def __init__(self, game):
+        self._game = game
+        self._steps: Steps = game.steps()
+        self._request: Union[DecisionRequest, None] = None
+        self._summary: Union[dict, None] = None
+        self._started = False
+
+    @property
+    def game(self):
+        return self._game
+
+    @property
+    def request(self) -> Union[DecisionRequest, None]:
+        """the decision the match waits for, None before it started and after it ended"""
+        return self._request
+
+    @property
+    def summary(self) -> Union[dict, None]:
+        """the match summary, once the match ended"""
+        return self._summary
+
+    @property
+    def is_over(self):
+        return self._summary is not None
+
+    def advance(self, answer=None) -> Union[DecisionRequest, None]:
+        """
+        starts the match, or answers the pending decision, and runs the match until the next one.
+
+        :return: the next decision, None when the match ended
+        """
+        request = self.resume(answer)
+        while request is None and not self.is_over:
+            request = self.resume()
+        return request
+
+    def resume(self, answer=None) -> Union[DecisionRequest, None]:
+        """
+        starts the match, answers the pending decision or goes on from a pause, and runs the match until the next
+        decision or pause.
+
+        :return: the next decision, None at a pause and when the match ended (see is_over)
+        """
+        if self.is_over:
+            print("the match is over, there is nothing to answer")
+            raise RuntimeError("match over")
+        with self._game.world.lock:
+            try:
+                if self._started:
+                    self._request = self._steps.send(answer)
+                else:
+                    self._started = True
+                    self._request = next(self._steps)
+            except StopIteration as stop:
+                self._request = None
+                self._summary = stop.value
+        return self._request
@@ -0,0 +1,226 @@
+from enum import IntEnum
+from struct import Struct
+from typing import Dict, Iterator, List, NamedTuple
+
+
+class EventKind(IntEnum):
+    MATCH_START = 0  # actor: left team id, target: right team id, value: game id
+    MATCH_END = 1  # value: game id
+    SET_START = 2
+    LINE_UP = 3  # actor starts a set, flags: IS_LEFT
+    SUBSTITUTION = 4  # actor came on for target, value: the position
+    CREATION = 5  # actor created the disc, flags: END_ZONE
+    DASH = 6
+    PASS = 7  # actor passed to target, value: blocks gained, flags: SUCCESS
+    ADVANCE = 8  # value: the column the actor came from, flags: HAD_DISC
+    STRIP = 9  # actor spent the turn in the touchdown strip
+    EVASION = 10  # target evaded actor's shot, flags: HAD_DISC (the target)
+    HIT = 11  # actor hit target, flags: HAD_DISC, END_ZONE (the target, before retreating)
+    ABSORB = 12  # actor absorbed a hit, value: the column the actor came from, flags: HAD_DISC
+    FALL = 13  # actor fell, value: the column the actor came from, flags: HAD_DISC
+    TAKEDOWN = 14  # actor took target down, flags: HAD_DISC, END_ZONE (the target, before falling)
+    TOUCHDOWN = 15  # flags: IS_LEFT
+    TURN_END = 16  # value: a TurnResult. for a drop the actor is the taker and the target the carrier
+
+
+class TurnResult(IntEnum):
+    DROP = 0
+    TOUCHDOWN = 1
+    TIME = 2
+
+
+# outcome flags
+HAD_DISC = 1
+END_ZONE = 2
+SUCCESS = 4
+IS_LEFT = 8
+
+
+class MatchEvent(NamedTuple):
+    """A single play of a match. ids are -1 and positions -1 where they don't apply."""
+    kind: EventKind
+    set: int
+    phase: int
+    turn: int
+    actor: int
+    target: int
+    actor_row: int
+    actor_column: int
+    target_row: int
+    target_column: int
+    value: int
+    outcome: int
+
+
+EVENT_STRUCT = Struct("<BHHBiibbbbiB")
+FILE_HEADER = b"DBEV1\n"
+
+
+class ListSink:
+    """Keeps the events in memory."""
+
+    def __init__(self):
+        self.events: List[MatchEvent] = []
+
+    def write(self, event: MatchEvent):
+        self.events.append(event)
+
+    def close(self):
+        pass
+
+
+class BinaryEventSink:
+    """
+    Appends events to a file of fixed-size binary records, through a buffered writer.
+
+    a new file starts with FILE_HEADER, an existing one is appended to.
+    """
+
+    def __init__(self, path: str, buffer_size: int = 1 << 16):
+        self._path = path
+        self._file = open(path, "ab", buffering=buffer_size)
+        if self._file.tell() == 0:
+            self._file.write(FILE_HEADER)
+        self._pack = EVENT_STRUCT.pack
+
+    @property
+    def path(self):
+        return self._path
+
+    def write(self, event: MatchEvent):
+        self._file.write(self._pack(*event))
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def read_events(path: str, chunk_size: int = 4096) -> Iterator[MatchEvent]:
+    """
+    reads an event file written by BinaryEventSink.
+
+    :return: generator of the events, in the order they were written
+    """
+    record_size = EVENT_STRUCT.size
+    kinds = list(EventKind)  # EventKind by value, faster than calling EventKind per record
+    new_tuple = tuple.__new__
+    with open(path, "rb") as file:
+        if file.read(len(FILE_HEADER)) != FILE_HEADER:
+            raise ValueError(f"{path} is not an event file")
+        while True:
+            data = file.read(record_size * chunk_size)
+            if not data:
+                return
+            if len(data) % record_size:
+                raise ValueError(f"{path} ends with a partial event")
+            for fields in EVENT_STRUCT.iter_unpack(data):
+                yield new_tuple(MatchEvent, (kinds[fields[0]],) + fields[1:])
+
+
+class TeeSink:
+    """Writes every event to several sinks."""
+
+    def __init__(self, *sinks):
+        self._sinks = sinks
+
+    def write(self, event: MatchEvent):
+        for sink in self._sinks:
+            sink.write(event)
+
+    def close(self):
+        for sink in self._sinks:
+            sink.close()
+
+
+class ConsoleSink:
+    """Prints the events a watching user should read, the way the engine used to print them."""
+
+    def __init__(self, players: Dict[int, object]):
+        self._players = players  # Player by id
+
+    def _name(self, player_id: int) -> str:
+        return self._players[player_id].format_name
+
+    def _is_star(self, player_id: int) -> bool:
+        return player_id in self._players and self._players[player_id].is_star_player
+
+    def write(self, event: MatchEvent):
+        kind = event.kind
+        if kind == EventKind.PASS:
+            if event.outcome & SUCCESS:
+                print(f"{self._name(event.actor)} ({event.actor_column}) passed it to "
+                      f"{self._name(event.target)} ({event.target_column})")
+            else:
+                print(f"a failed pass by {self._name(event.actor)} to {self._name(event.target)}")
+        elif kind == EventKind.DASH:
+            print(f"{self._name(event.actor)} decided to dash")
+        elif kind == EventKind.TURN_END:
+            if event.value == TurnResult.DROP:
+                print(f"{self._name(event.actor)} has manage to take {self._name(event.target)} down!")
+            elif event.value == TurnResult.TOUCHDOWN:
+                print(f"{self._name(event.actor)} scored a touchdown!")
+            else:
+                print(f"Time! the disc is now free!")
+        elif kind == EventKind.SUBSTITUTION:
+            print(f"{self._name(event.actor)} came on for {self._name(event.target)} at position {event.value}")
+        elif kind == EventKind.EVASION:
+            if self._is_star(event.target):
+                print(f"{self._name(event.target)} has managed to evade a shot!")
+            if self._is_star(event.actor):
+                print(f"{self._name(event.actor)} has missed!")
+        elif kind == EventKind.HIT:
+            if self._is_star(event.actor):
+                print(f"{self._name(event.actor)} has made a successful shot!")
+        elif kind in (EventKind.ADVANCE, EventKind.ABSORB, EventKind.FALL):
+            if self._is_star(event.actor):
+                verb = {EventKind.ADVANCE: "advanced", EventKind.ABSORB: "retreated", EventKind.FALL: "fell"}[kind]
+                print(f"{self._name(event.actor)} used to be at {event.value}, and {verb} to {event.actor_column}")
+
+    def close(self):
+        pass
+
+
+class MatchRecorder:
+    """Stamps the events of a game with its current set, phase and turn and hands them to a sink."""
+
+    def __init__(self, game, sink):
+        self._game = game
+        self._sink = sink
+
+    @property
+    def sink(self):
+        return self._sink
+
+    def emit(self, kind: EventKind, actor=None, target=None, value: int = 0, outcome: int = 0):
+        """
+        :param actor: the Player the event is about, if any
+        :param target: the other Player involved, if any
+        """
+        game = self._game
+        self._sink.write(MatchEvent(
+            kind, game.set_counter, game.phase_counter, game.turn_counter,
+            -1 if actor is None else actor.get_id, -1 if target is None else target.get_id,
+            _coordinate(actor, "row"), _coordinate(actor, "column"),
+            _coordinate(target, "row"), _coordinate(target, "column"),
+            value, outcome))
+
+    def emit_raw(self, kind: EventKind, actor_id: int = -1, target_id: int = -1, value: int = 0, outcome: int = 0):
+        """emits an event about ids rather than players (teams, the game itself)."""
+        game = self._game
+        self._sink.write(MatchEvent(kind, game.set_counter, game.phase_counter, game.turn_counter,
+                                    actor_id, target_id, -1, -1, -1, -1, value, outcome))
+
+
+def _coordinate(player, name: str) -> int:
+    if player is None:
+        return -1
+    value = getattr(player, name)
+    return -1 if value is None else value
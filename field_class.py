@@ -1,4 +1,30 @@
-from constants import Color, NUM_OF_PLAYERS_IN_LINE_UP, paint
+from math import dist
+from constants import Color, NUM_OF_PLAYERS_IN_LINE_UP, NUM_OF_ROWS, NUM_OF_COLUMNS, paint
+
+
+def _build_distance_table():
+    """
+    computes the distance of every (row, column) offset that can occur on the field.
+
+    a negative offset is stored at its negative index, so DISTANCES[row1 - row2][column1 - column2] is the distance
+    between the two blocks without any further arithmetic.
+    """
+    row_offsets = NUM_OF_ROWS * 2 - 1
+    column_offsets = NUM_OF_COLUMNS * 2 - 1
+    table = [[0.0] * column_offsets for _ in range(row_offsets)]
+    for row_difference in range(-(NUM_OF_ROWS - 1), NUM_OF_ROWS):
+        for column_difference in range(-(NUM_OF_COLUMNS - 1), NUM_OF_COLUMNS):
+            table[row_difference][column_difference] = dist((row_difference, 0), (0, column_difference))
+    return table
+
+
+def _build_end_zone_table():
+    """END_ZONE_DISTANCES[is_left][column] is the number of blocks between the column and that side's end zone."""
+    return [[abs(column - threshold) for column in range(NUM_OF_COLUMNS)] for threshold in [11, 10]]
+
+
+DISTANCES = _build_distance_table()
+END_ZONE_DISTANCES = _build_end_zone_table()
 
 
 class Block:
@@ -13,9 +39,11 @@ class Block:
     def col_coordinate(self):
         return self._col_coordinate
 
+    def cell(self, color: Color):
+        return "*" if self._occupied else " ", color
+
     def light_up(self, color: Color):
-        text = "*" if self._occupied else " "
-        return paint(text, color)
+        return paint(*self.cell(color))
 
     def set_color(self, color: Color):
         self._color = color
@@ -29,42 +57,50 @@ class Block:
 
 
 class Row:
-    _id_counter = 0  # Static counter for unique IDs
-    _all_instances = []  # Static list to keep track of all instances
-
-    def __init__(self, color_left, color_right):
-        self._id = Row._id_counter
-        Row._id_counter += 1
+    def __init__(self, color_left, color_right, row_id: int):
+        self._id = row_id
         self.row_list = [Block(color_left, self._id, i) for i in range(11)] + \
                         [Block(color_right, self._id, j) for j in range(11, 22)]
         self.row_string = ""
 
-    def make_row_str(self, column, player_color: Color):
-        row_lst = []
+    def make_row_cells(self, column, player_color: Color):
+        """
+        :return: list of (character, color) of every block in the row, with the player at the given column
+        """
+        cells = []
         for block in self.row_list:
             block.clear_block()
             if block.col_coordinate == column:
                 block.inhabit_block()
-            row_lst.append(block.light_up(player_color))
-        return "|".join(row_lst)
+            cells.append(block.cell(player_color))
+        return cells
+
+    def make_row_str(self, column, player_color: Color):
+        return "|".join(paint(text, color) for text, color in self.make_row_cells(column, player_color))
 
 
 class Field:
 
     def __init__(self, color_left, color_right, carrier_color):
-        self._field_matrice = [Row(color_left, color_right) for _ in range(NUM_OF_PLAYERS_IN_LINE_UP * 2)]
+        self._field_matrice = [Row(color_left, color_right, i) for i in range(NUM_OF_PLAYERS_IN_LINE_UP * 2)]
         self._color_left: Color = color_left
         self._color_right: Color = color_right
         self._carrier_color: Color = carrier_color
 
+    def _row_color(self, i, carrier_row) -> Color:
+        if i == carrier_row:
+            return self._carrier_color
+        return self._color_left if i % 2 == 0 else self._color_right
+
+    def frame_cells(self, columns, carrier_row):
+        """
+        :return: the whole field as rows of (character, color), ready for a FrameRenderer
+        """
+        return [self._field_matrice[i].make_row_cells(columns[i], self._row_color(i, carrier_row))
+                for i in range(NUM_OF_PLAYERS_IN_LINE_UP * 2)]
+
     def print_field(self, columns, carrier_row):
         field_lst = []
         for i in range(NUM_OF_PLAYERS_IN_LINE_UP * 2):
-            if i % 2 == 0:
-                color = self._color_left
-            else:
-                color = self._color_right
-            if i == carrier_row:
-                color = self._carrier_color
-            field_lst.append(self._field_matrice[i].make_row_str(columns[i], color))
+            field_lst.append(self._field_matrice[i].make_row_str(columns[i], self._row_color(i, carrier_row)))
         print("\n".join(field_lst))
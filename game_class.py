@@ -1,39 +1,24 @@
 from team_class import Team
 from player_class import Player
 from time import sleep
-from typing import Union, List
+from typing import Callable, Generator, Union, List
 from constants import COLOR_DICT, POINTS_FOR_WIN, Color, NUM_OF_PLAYERS_IN_LINE_UP
-from random import choices
-from os import system
 from field_class import Field
+from renderer_class import FrameRenderer
+from shooting_logic import resolve_shooting, shooting_steps
+from rng_logic import MatchRandom
+from timing_class import StageTimer
+from world_class import World
+from events_class import EventKind, TurnResult, MatchRecorder, ConsoleSink, TeeSink
+from decision_class import DecisionRequest, Steps, answer_in_console, run_steps
 
 
 class Game:
-    _id_counter = 0  # Static counter for unique IDs
-    _all_instances = []  # Static list to keep track of all instances
 
     @staticmethod
-    def _choose_target(shooter: Player, eligible_players: List[Player]) -> Player:
-        probabilities = []
-        for rival in eligible_players:
-            distance = shooter.calculate_distance_to(rival)
-            rival_prob = 1
-            if rival.has_disc:
-                rival_prob *= 5
-            if rival.column in [10, 11]:
-                rival_prob *= 2
-            try:
-                probabilities.append(rival_prob / distance)
-            except ZeroDivisionError:
-                print(f"{shooter.format_name} tried to shoot {rival.format_name} "
-                      f"but the distance calculated was {distance}")
-                raise ZeroDivisionError
-        return Game._choose_player_by_probabilities(eligible_players, probabilities)
-
-    @staticmethod
-    def _choose_player_by_probabilities(options: list, probabilities: list) -> Player:
+    def _choose_player_by_probabilities(options: list, probabilities: list, rng: MatchRandom) -> Player:
         try:
-            result = choices(options, weights=probabilities)[0]
+            result = rng.choices(options, weights=probabilities)[0]
         except IndexError:
             print(f"options were {options}, probs were {probabilities}")
             raise IndexError
@@ -44,10 +29,13 @@ class Game:
         if score in [3, 6, 9]:
             team.allow_substitution()
 
-    def __init__(self, left_team: Team, right_team: Team):
-        Game._id_counter += 1
-        Game._all_instances.append(self)
-        self._id = Game._id_counter
+    def __init__(self, left_team: Team, right_team: Team, headless: bool = False, rng: MatchRandom = None,
+                 timer: StageTimer = None, event_sink=None):
+        if left_team.world is not right_team.world:
+            print(f"{left_team.name} and {right_team.name} belong to different worlds")
+            raise ValueError("teams of different worlds")
+        self._world: World = left_team.world
+        self._id = self._world.add_game(self)
 
         self._left_team: Team = left_team
         self._right_team: Team = right_team
@@ -56,16 +44,54 @@ class Game:
         self._set_counter = 0
         self._phase_counter = 0
         self._turn_counter = 0
+        self._total_phases = 0
+        self._total_turns = 0
+        self._headless: bool = headless
+        self._rng: MatchRandom = rng if rng is not None else MatchRandom()
         self._carrier_color: Color = self._determine_carrier_color()
         self.field = Field(left_team.color, right_team.color, self._carrier_color)
+        self._renderer: Union[FrameRenderer, None] = None if headless else FrameRenderer()
         self._carrier: Union[Player, None] = None
         self._running_team: Union[Team, None] = None
         self._shooting_team: Union[Team, None] = None
+        self._timer: Union[StageTimer, None] = timer
+        self._event_sink = event_sink  # gets every MatchEvent of the match, see events_class
+        self._recorder: Union[MatchRecorder, None] = None
+        if timer is not None:
+            timer.instrument(self)
 
     @property
     def get_id(self):
         return self._id
 
+    @property
+    def world(self) -> World:
+        return self._world
+
+    @property
+    def headless(self):
+        return self._headless
+
+    @property
+    def rng(self):
+        return self._rng
+
+    @property
+    def timer(self):
+        return self._timer
+
+    @property
+    def set_counter(self):
+        return self._set_counter
+
+    @property
+    def phase_counter(self):
+        return self._phase_counter
+
+    @property
+    def turn_counter(self):
+        return self._turn_counter
+
     # Properties for scores
     @property
     def right_score(self):
@@ -138,12 +164,56 @@ class Game:
         return final_column_lst
 
     def _declare_teams(self):
+        if self._headless:
+            return
         print(f"{self._left_team.format_team_name()} Vs {self._right_team.format_team_name()}")
 
-    def _prepare_match(self):
+    def _reset_match_state(self):
         self._left_team.is_left = True
         self._right_team.is_left = False
         self._set_counter = 0
+        self._phase_counter = 0
+        self._turn_counter = 0
+        self._total_phases = 0
+        self._total_turns = 0
+        for team in self.teams:
+            team.reset_match_stats()
+        self._start_recording()
+        if self._recorder is not None:
+            self._recorder.emit_raw(EventKind.MATCH_START, self._left_team.team_id, self._right_team.team_id,
+                                    self._id)
+
+    def _start_recording(self):
+        """
+        attaches a recorder to every player of both rosters. a watched game prints its events through a
+        ConsoleSink, a headless one records only if it was given an event sink.
+        """
+        players = [player for team in self.teams for player in team.roster]
+        sinks = []
+        if not self._headless:
+            sinks.append(ConsoleSink({player.get_id: player for player in players}))
+        if self._event_sink is not None:
+            sinks.append(self._event_sink)
+        if not sinks:
+            self._recorder = None
+        else:
+            self._recorder = MatchRecorder(self, sinks[0] if len(sinks) == 1 else TeeSink(*sinks))
+        for player in players:
+            player.recorder = self._recorder
+
+    def _stop_recording(self):
+        for team in self.teams:
+            for player in team.roster:
+                player.recorder = None
+        self._recorder = None
+
+    def _emit(self, kind: EventKind, actor: Player = None, target: Player = None, value: int = 0,
+              outcome: int = 0):
+        if self._recorder is not None:
+            self._recorder.emit(kind, actor, target, value, outcome)
+
+    def _prepare_match(self):
+        self._reset_match_state()
         for team in self.teams:
             team.reset_all_positions()
             team.inhibit_substitution()
@@ -153,7 +223,7 @@ class Game:
         eligible_players = \
             [player for player in self.on_field_players if player.column not in [0, 21]]
         creating_attributes = [player.creating for player in eligible_players]
-        self._set_carrier(Game._choose_player_by_probabilities(eligible_players, creating_attributes))
+        self._set_carrier(Game._choose_player_by_probabilities(eligible_players, creating_attributes, self._rng))
         self._carrier.create_disc()
         self._determine_running_and_shooting_team()
 
@@ -180,30 +250,68 @@ class Game:
         return "".join(str_list)
 
     def _declare_state(self):
-        system("cls")
-        print("\n")
-        self.field.print_field(self._get_columns(), self._carrier.row)
-
-        print(self._wrap_with_placeholders(self._left_team.format_team_name(), self._right_team.format_team_name()))
-        print(self._wrap_with_placeholders(str(self._left_score), str(self._right_score)))
-        print(f"set : {self._set_counter}, phase: {self._phase_counter}, turn: {self._turn_counter}")
+        if self._headless:
+            return
+        lines = [
+            self._wrap_with_placeholders(self._left_team.format_team_name(), self._right_team.format_team_name()),
+            self._wrap_with_placeholders(str(self._left_score), str(self._right_score)),
+            f"set : {self._set_counter}, phase: {self._phase_counter}, turn: {self._turn_counter}"
+        ]
         if self._carrier is not None:
-            print(f"{self._carrier.format_name} holds the disc at position {self._carrier.row, self._carrier.column}")
+            lines.append(f"{self._carrier.format_name} holds the disc at position "
+                         f"{self._carrier.row, self._carrier.column}")
+        self._renderer.draw(self.field.frame_cells(self._get_columns(), self._carrier.row), lines)
 
     def _conclude_match(self):
-        print(f"{self._left_team.name if self._left_score == POINTS_FOR_WIN else self._right_team.name} "
-              f"won! \n"
-              f"the final score was {self._left_score} : {self._right_score}")
+        if self._recorder is not None:
+            self._recorder.emit_raw(EventKind.MATCH_END, value=self._id)
+        self._stop_recording()
+        if self._renderer is not None:
+            self._renderer.release()
+        if not self._headless:
+            print(f"{self._winner().name} won! \n"
+                  f"the final score was {self._left_score} : {self._right_score}")
+        top_summary = None if self._headless else self.get_top_summary()
         for team in self.teams:
             team.finish_match()
             for player in team.roster:
-                if player.game_table["sets_played"][0] > 0:
-                    player.present_player_game_stats(self.get_player_in_top_summary(player))
+                if player.current_match_stat("sets_played") > 0:
+                    if not self._headless:
+                        player.present_player_game_stats(top_summary.get(player.get_id, []))
                     player.is_star_player = False
 
+    def _winner(self) -> Team:
+        return self._left_team if self._left_score == POINTS_FOR_WIN else self._right_team
+
+    def get_match_summary(self) -> dict:
+        """
+        summarizes the match without rendering anything.
+
+        :return: dict of the teams' names, the score, the number of sets, phases and turns played, the match
+        stats of every player in both rosters and the ratings of those who played (by player id). a timed game
+        also reports its stage timings (simulate is still running at that point, its own time is in the timer's
+        later reports)
+        """
+        summary = {
+            "left team": self._left_team.name,
+            "right team": self._right_team.name,
+            "left score": self._left_score,
+            "right score": self._right_score,
+            "winner": self._winner().name,
+            "sets": self._set_counter,
+            "phases": self._total_phases,
+            "turns": self._total_turns,
+            "players": {player.get_id: player.match_stats()
+                        for team in self.teams for player in team.roster},
+            "ratings": self._world.rate_match(player.get_id for team in self.teams for player in team.roster)
+        }
+        if self._timer is not None:
+            summary["timings"] = self._timer.report()
+        return summary
+
     def _check_touchdown(self) -> bool:
         if self._carrier.column in [10, 11]:
-            self._carrier.touchdown()
+            self._carrier.touchdown(self._running_team.is_left)
             if self._running_team is self._left_team:
                 self._left_score += 1
                 self._substitution_control(self._left_score, self._left_team)
@@ -223,43 +331,59 @@ class Game:
         while True:
             # a loop that runs until a touchdown is scored, the carrier drops the disc or there were more than 10 turns
             self._turn_counter += 1
+            self._total_turns += 1
 
             self._declare_state()
 
             for team in self.teams:
-                team.advance_all()
+                team.advance_all(self._rng)
 
             taker = None
-            there_was_a_drop = False
-            for player in self._shooting_team.line_up:
-                target_player = Game._choose_target(player, self._running_team.line_up)
-                there_was_a_fall = Player.face_off(player, target_player, self._running_team.is_left)
+            for player, target_player, there_was_a_fall in self._face_offs():
                 if there_was_a_fall and target_player is self.carrier:
-                    there_was_a_drop = True
-                    taker = player.format_name
+                    taker = player
 
-            if there_was_a_drop:
-                self._declare_state()
-                print(f"{taker} has manage to take {self._carrier.format_name} down!")
-                sleep(sleep_timer)
+            if taker is not None:
+                self._end_turn(TurnResult.DROP, sleep_timer, taker)
                 return "Drop"
 
             if self._check_touchdown():
-                self._declare_state()
-                print(f"{self._carrier.format_name} scored a touchdown!")
-                sleep(sleep_timer)
+                self._end_turn(TurnResult.TOUCHDOWN, sleep_timer)
                 return "Touchdown"
 
             if self._turn_counter > 9:
-                self._declare_state()
-                print(f"Time! the disc is now free!")
-                sleep(sleep_timer)
+                self._end_turn(TurnResult.TIME, sleep_timer)
                 return "Time"
 
+    def _end_turn(self, result: TurnResult, sleep_timer: float, taker: Player = None):
+        """
+        shows the final state of a turn and reports how it ended.
+
+        :param taker: the player who took the carrier down, for a drop
+        """
+        self._declare_state()
+        if result == TurnResult.DROP:
+            self._emit(EventKind.TURN_END, taker, self._carrier, result)
+        else:
+            self._emit(EventKind.TURN_END, self._carrier, value=result)
+        if not self._headless:
+            sleep(sleep_timer)
+
+    def _face_offs(self, choose_target=None):
+        return resolve_shooting(self._shooting_team.line_up, self._running_team.line_up, self._running_team.is_left,
+                                self._rng, choose_target)
+
+    def _face_off_steps(self, choose_target):
+        """_face_offs, for a choose_target that may wait for decisions (see shooting_steps)"""
+        return shooting_steps(self._shooting_team.line_up, self._running_team.line_up, self._running_team.is_left,
+                              self._rng, choose_target)
+
     def _phase(self):
         self._phase_counter = 0
         while True:
             self._phase_counter += 1
+            self._total_phases += 1
+            self._turn_counter = 0
             self._creating_competition()
             self._declare_state()
             if not self.dash_or_successful_pass():
@@ -268,22 +392,63 @@ class Game:
             if result == "Touchdown":
                 break
 
-    def set(self):
+    def _start_set(self):
         self._set_counter += 1
+        self._phase_counter = 0
+        self._turn_counter = 0
+        if self._recorder is not None:
+            self._recorder.emit_raw(EventKind.SET_START)
+
+    def _announce_substitution(self, entering_player: Player, exiting_player: Player):
+        self._emit(EventKind.SUBSTITUTION, entering_player, exiting_player, exiting_player.position)
+
+    def _prepare_set(self):
+        self._start_set()
         for team in self.teams:
             if team.can_substitute:
-                team.decide_substitution()
+                self._announce_substitution(*team.decide_substitution(self._rng))
 
             team.reset_all_positions()
             team.add_set_to_players_count()
 
+    def set(self):
+        self._prepare_set()
         self._phase()
 
-    def simulate(self):
+    # decision steps. a game with a human in it overrides these, an AI game makes every decision itself
+    def _prepare_steps(self) -> Generator[DecisionRequest, object, None]:
         self._prepare_match()
+        yield from ()
+
+    def _set_steps(self) -> Generator[DecisionRequest, object, None]:
+        self.set()
+        yield from ()
+
+    def steps(self) -> Steps:
+        """
+        plays the match one decision at a time.
+
+        a generator that yields a DecisionRequest whenever a human has to decide, expects the answer to be sent back
+        and returns the match summary. it also yields None after every set, a pause where the caller may let other
+        work run before sending None to go on. see MatchSteps to drive it, or simulate to play it through.
+        """
+        yield from self._prepare_steps()
         while self._left_score < POINTS_FOR_WIN and self._right_score < POINTS_FOR_WIN:
-            self.set()
+            yield from self._set_steps()
+            yield None
         self._conclude_match()
+        summary = self.get_match_summary()
+        self._world.roll_up_match_stats([player.get_id for team in self.teams for player in team.roster])
+        return summary
+
+    def simulate(self, answer: Callable[[DecisionRequest], object] = answer_in_console) -> dict:
+        """
+        plays the whole match, holding the world's lock so no other match of the world runs meanwhile.
+
+        :param answer: answers the decisions of a game with a human in it, from the keyboard by default
+        """
+        with self._world.lock:
+            return run_steps(self.steps(), answer)
 
     def decide_pass_probabilities(self):
         running_is_left = self._running_team.is_left
@@ -310,42 +475,30 @@ class Game:
 
     def dash_or_successful_pass(self):
         probabilities = self.decide_pass_probabilities()
-        target = self._choose_player_by_probabilities(self._running_team.line_up, probabilities)
+        target = self._choose_player_by_probabilities(self._running_team.line_up, probabilities, self._rng)
         if target is not self._carrier:
             return self.pass_try(target)
         else:
             self._carrier.dash()
-            print(f"{self._carrier.format_name} decided to dash")
             return True
 
     def pass_try(self, target: Player):
-        pass_result = Player.pass_play(self._carrier, target, self._running_team.is_left)
+        pass_result = Player.pass_play(self._carrier, target, self._running_team.is_left, self._rng)
         if pass_result:
-            print(
-                f"{self._carrier.format_name} ({self._carrier.column}) passed it to {target.format_name} ({target.column})")
             self._carrier = target
-        else:
-            print(f"a failed pass by {self._carrier.format_name} to {target.format_name}")
         return pass_result
 
+    def get_top_summary(self) -> dict:
+        """
+        finds the match leaders of every stat (but sets_played) among both rosters, ties included.
+
+        :return: dict of player id to the stats that player leads, for players that lead at least one
+        """
+        return self._world.match_leaders(player.get_id for player in self._left_team.roster + self._right_team.roster)
+
     def top_players(self, stat: str):
-        threshold = 0
-        top_list = []
-        for player in self._left_team.roster + self._right_team.roster:
-            temp = player.current_match_stat(stat)
-            if temp > threshold:
-                top_list = [player]
-                threshold = temp
-            elif temp == threshold and threshold != 0:
-                top_list.append(player)
-        return top_list
+        top_ids = [player_id for player_id, stats in self.get_top_summary().items() if stat in stats]
+        return [player for player in self._left_team.roster + self._right_team.roster if player.get_id in top_ids]
 
     def get_player_in_top_summary(self, player: Player):
-        player_top_list = []
-        keys = player.game_table.keys()
-        for stat in keys:
-            if stat == "sets_played":
-                continue
-            if player in self.top_players(stat):
-                player_top_list.append(stat)
-        return player_top_list
+        return self.get_top_summary().get(player.get_id, [])
@@ -0,0 +1,98 @@
+from typing import Dict, Iterable, List, Tuple
+
+from numpy import argpartition, asarray, flatnonzero
+
+from stats_class import StatsStore, STAT_NAMES, STAT_INDEX
+
+Entry = Tuple[int, int]  # player id, value
+
+
+def _top_with_ties(candidates: Dict[int, int], k: int) -> List[Entry]:
+    """:return: the k best (id, value) entries of candidates and whoever ties the k-th, best first"""
+    entries = sorted(candidates.items(), key=lambda entry: (-entry[1], entry[0]))
+    if len(entries) <= k:
+        return entries
+    kth_value = entries[k - 1][1]
+    end = k
+    while end < len(entries) and entries[end][1] == kth_value:
+        end += 1
+    return entries[:end]
+
+
+class Leaderboard:
+    """
+    The top k players of every stat of a StatsStore, kept up to date as the store changes.
+
+    a board holds the k best players with more than 0 of a stat, and everyone tied with the k-th. changed rows are
+    only compared with the board, the whole column is searched again (with argpartition) only when a board member's
+    value went down.
+    """
+
+    def __init__(self, store: StatsStore, k: int = 10, skip: Iterable[str] = ("sets_played",)):
+        self._store = store
+        self._k = k
+        self._slots = [STAT_INDEX[stat] for stat in STAT_NAMES if stat not in skip]
+        self._boards: Dict[int, List[Entry]] = {}
+        self.reset()
+        store.subscribe(self)
+
+    @property
+    def k(self):
+        return self._k
+
+    def close(self):
+        self._store.unsubscribe(self)
+
+    def top(self, stat: str) -> List[Entry]:
+        """:return: list of (player id, value) of the stat's board, best first"""
+        return list(self._boards[STAT_INDEX[stat]])
+
+    def leaders(self) -> Dict[str, List[int]]:
+        """:return: dict of every stat to the ids of the players that lead it (ties included), if anyone does"""
+        leaders = {}
+        for slot in self._slots:
+            board = self._boards[slot]
+            if board:
+                best = board[0][1]
+                leaders[STAT_NAMES[slot]] = [player_id for player_id, value in board if value == best]
+        return leaders
+
+    # store notifications
+    def reset(self):
+        """rebuilds every board from the whole store."""
+        for slot in self._slots:
+            self._rebuild(slot)
+
+    def rows_changed(self, player_ids: Iterable[int]):
+        player_ids = asarray(list(player_ids), dtype=int)
+        if not len(player_ids):
+            return
+        rows = self._store.values[player_ids]
+        positions = {player_id: i for i, player_id in enumerate(player_ids.tolist())}
+        for slot in self._slots:
+            board = self._boards[slot]
+            column = rows[:, slot]
+            member_went_down = False
+            for player_id, value in board:
+                i = positions.get(player_id)
+                if i is not None and column[i] < value:
+                    member_went_down = True
+                    break
+            if member_went_down:
+                self._rebuild(slot)
+                continue
+            floor = board[-1][1] if len(board) >= self._k else 1
+            eligible = flatnonzero(column >= floor)
+            if not len(eligible):
+                continue
+            candidates = dict(board)
+            candidates.update(zip(player_ids[eligible].tolist(), column[eligible].tolist()))
+            self._boards[slot] = _top_with_ties(candidates, self._k)
+
+    def _rebuild(self, slot: int):
+        column = self._store.values[:, slot]
+        positive = flatnonzero(column > 0)
+        if len(positive) > self._k:
+            kth_value = column[argpartition(-column, self._k - 1)[:self._k]].min()
+            positive = flatnonzero(column >= kth_value)
+        self._boards[slot] = _top_with_ties(dict(zip(positive.tolist(), column[positive].tolist())), self._k)
@@ -1,150 +1,69 @@
 from constants import COLOR_RESET, COLOR_DICT
-from data import import_players
-from pandas import DataFrame
-from random import randint
-from math import dist
+from roster_class import RosterRepository
+from stats_class import STAT_NAMES
+from pool_class import PlayerPool, NO_BLOCK
+from world_class import World, resolve_world
+from field_class import DISTANCES, END_ZONE_DISTANCES
+from events_class import EventKind, HAD_DISC, END_ZONE, SUCCESS, IS_LEFT
+import rating_logic
+import random
 
 
 class Player:
-    """A class representing a player during a game."""
-    _id_counter = 0  # Static counter for unique IDs
-    _all_instances = []  # Static list to keep track of all instances
-
-    @staticmethod
-    def _create_player_df():
-        stats_dict = {
-            "sets_played": [0],
-            # offensive
-            # points gain
-            "touchdowns": [0],
-            "assists": [0],
-
-            # advancements
-            "distance_carried": [0],
-            "distance_passed": [0],
-            "advancement_by_catch": [0],
-
-            # creating
-            "creations": [0],
-            "end_zone_creation": [0],
-
-            # holding
-            "carrier_evasions": [0],
-            "drop_avoidance": [0],
-
-            # defensive
-            "last_ditch_hits": [0],
-            "last_ditch_takedowns": [0],
-            "carrier_takedowns": [0],
-            "carrier_hits": [0],
-
-            # formation
-            # positioning
-            "distance_covered": [0],
-            "turns_in_touchdown_strip": [0],
-            "evasions": [0],
-            "fall_avoidance": [0],
-
-            # pressure
-            "successful_shots": [0],
-            "successful_takedowns": [0],
-
-            # fails
-            # offensive fail
-            "drops_made": [0],
-            "failed_passes": [0],
-            "failed_catches": [0],
-
-            # positioning fails
-            "hits_taken": [0],
-            "balance_losses": [0],
-
-            # pass numbers
-            "passes_made": [0],
-            "catches_made": [0],
-            "dashes": [0]
-        }
-        return DataFrame(stats_dict)
-
-    def __init__(self):
-        data = import_players().loc[Player._id_counter]
-        # personal
-        self._id = Player._id_counter
-        Player._id_counter += 1
-        Player._all_instances.append(self)
-        self._name = data["Name"]
-
-        # team related
-        self._team = data["Team"]
-        self._color = COLOR_DICT[data["Color"]]
-
-        # attributes
-        self._speed = data["speed"]
-        self._agility = data["agility"]
-        self._creating = data["creating"]
-        self._shooting = data["shooting"]
-        self._stability = data["stability"]
-        self._stamina = data["stamina"]
-        self._distribution = data["distribution"]
-        self._control = data["control"]
-        self.value = 0  # TODO: value logic
-
-        # gameplay related
-        self._has_disc = False
-        self._on_field = False
-        self._position = None
-        self._has_disc = False
-        self._row = None
-        self._column = None
-        self._delay = False
-        self._fatigue = 0
-
-        #  stat related
-        # TODO: think if this requires properties
-        self.game_table = Player._create_player_df()
-        self.season_table = Player._create_player_df()
-        self.all_time_stats = Player._create_player_df()
-
-        self.is_star_player: bool = False
+    """A player, as a view of its slot in the PlayerPool of the World it belongs to."""
+    __slots__ = ("_world", "_pool", "_id")
+
+    def __init__(self, record: dict = None, world: World = None):
+        self._world: World = resolve_world(world)
+        data = record if record is not None else RosterRepository.default().get_record(len(self._world.players))
+        self._pool: PlayerPool = self._world.pool
+        self._id = self._world.add_player(self, data)
 
     # class methods
     @classmethod
     def get_all_instances(cls):
-        """Class method to retrieve all instances."""
-        return cls._all_instances
+        """Class method to retrieve all instances of the default world."""
+        return World.default().players
 
     @classmethod
     def delete_all_instances(cls):
-        """Class method to retrieve all instances."""
-        for item in cls._all_instances:
-            del item
-        cls._all_instances.clear()
-        cls._id_counter = 0
+        """Class method to forget every player (and team and stat) of the default world."""
+        World.default().clear()
 
     @classmethod
-    def face_off(cls, shooting_player, target_player, target_is_left: bool):
-        shot_quality = randint(1, shooting_player.shooting) // shooting_player.calculate_distance_to(target_player)
-        evasion_attempt = randint(1, target_player.agility)
+    def face_off(cls, shooting_player, target_player, target_is_left: bool,
+                 shot_quality: float = None, evasion_attempt: int = None, retreat_blocks: int = None, rng=random):
+        """
+        resolves a single shot. the shot quality, evasion attempt and retreat may be drawn in advance
+        (see shooting_logic), otherwise they are drawn here from rng.
+        """
+        if shot_quality is None:
+            shot_quality = \
+                rng.randint(1, shooting_player.shooting) // shooting_player.calculate_distance_to(target_player)
+        if evasion_attempt is None:
+            evasion_attempt = rng.randint(1, target_player.agility)
         if shot_quality <= evasion_attempt:
             target_player.evade()
-            if shooting_player.is_star_player:
-                print(f"{shooting_player.format_name} has missed!")
+            shooting_player._emit(EventKind.EVASION, target_player, outcome=HAD_DISC * target_player.has_disc)
             return False
         else:
             target_is_carrier = target_player.has_disc
             target_initial_column = target_player.column
+            target_state = HAD_DISC * target_is_carrier | END_ZONE * (target_initial_column in [10, 11])
             shooting_player.hit_target(target_is_carrier, target_initial_column)
-            there_was_a_fall = target_player.retreat(shot_quality, target_is_left)
+            shooting_player._emit(EventKind.HIT, target_player, outcome=target_state)
+            there_was_a_fall = target_player.retreat(shot_quality, target_is_left, retreat_blocks, rng)
             if there_was_a_fall:
                 shooting_player.takedown(target_is_carrier, target_initial_column)
+                shooting_player._emit(EventKind.TAKEDOWN, target_player, outcome=target_state)
             return there_was_a_fall
 
     @classmethod
-    def pass_play(cls, passer, catcher, is_left):
-        pass_attempt = randint(1, passer.distribution)
-        catch_attempt = randint(1, catcher.control)
+    def pass_play(cls, passer, catcher, is_left, rng=random):
+        pass_attempt = rng.randint(1, passer.distribution)
+        catch_attempt = rng.randint(1, catcher.control)
         distance = passer.calculate_distance_to(catcher)
-        threshold = randint(1, 20) * distance
+        threshold = rng.randint(1, 20) * distance
         blocks_difference = passer.compare_columns(catcher, is_left)
         if pass_attempt > 0.75 * threshold:
             catch_attempt *= 1.5
@@ -152,11 +71,13 @@ class Player:
 
             passer.pass_disc(blocks_difference)
             catcher.catch_disc(blocks_difference)
+            passer._emit(EventKind.PASS, catcher, blocks_difference, SUCCESS)
             return True
         else:
             passer.pass_fail()
             passer.give_disc_away()
             catcher.catch_fail()
+            passer._emit(EventKind.PASS, catcher, blocks_difference)
             return False
 
     # Properties
@@ -164,146 +85,199 @@ class Player:
     def get_id(self):
         return self._id
 
+    @property
+    def world(self) -> World:
+        return self._world
+
+    @property
+    def pool(self) -> PlayerPool:
+        return self._pool
+
+    @property
+    def record(self) -> dict:
+        """the roster row this player was built from, enough to rebuild it in another process."""
+        return self._pool.record(self._id)
+
     @property
     def name(self):
-        return self._name
+        return self._pool.names[self._id]
 
     @property
     def team(self):
-        return self._team
+        return self._pool.teams[self._id]
 
     @property
     def color(self) -> str:
-        return self._color
+        return COLOR_DICT[self._pool.color_names[self._id]]
 
     @property
     def speed(self):
-        return self._speed
+        return self._pool.speed[self._id]
 
     @property
     def agility(self):
-        return self._agility
+        return self._pool.agility[self._id]
 
     @property
     def creating(self):
-        return self._creating
+        return self._pool.creating[self._id]
 
     @property
     def shooting(self):
-        return self._shooting
+        return self._pool.shooting[self._id]
 
     @property
     def stability(self):
-        return self._stability
+        return self._pool.stability[self._id]
 
     @property
     def stamina(self):
-        return self._stamina
+        return self._pool.stamina[self._id]
 
     @property
     def distribution(self):
-        return self._distribution
+        return self._pool.distribution[self._id]
 
     @property
     def control(self):
-        return self._control
+        return self._pool.control[self._id]
 
     @property
     def attributes(self):
-        return self._speed, self._agility, self._creating, self._shooting, self._stability, self._distribution, \
-            self._control
+        return self.speed, self.agility, self.creating, self.shooting, self.stability, self.distribution, \
+            self.control
 
     @property
     def attribute_names(self):
         return "speed, agility, creating, shooting, stability, distribution, control".split(", ")
 
+    @property
+    def value(self):  # TODO: value logic
+        return self._pool.value[self._id]
+
+    @value.setter
+    def value(self, value: int):
+        self._pool.value[self._id] = value
+
     # Property for has_disc
     @property
     def has_disc(self):
-        return self._has_disc
+        return self._pool.has_disc[self._id] == 1
 
     @property
     def on_field(self):
-        return self._on_field
+        return self._pool.on_field[self._id] == 1
 
     @property
     def position(self):
-        return self._position
+        position = self._pool.position[self._id]
+        return None if position == NO_BLOCK else position
 
     @position.setter
     def position(self, value: int):
-        self._position = value
+        self._pool.position[self._id] = NO_BLOCK if value is None else value
 
     @property
     def row(self):
-        return self._row
+        row = self._pool.row[self._id]
+        return None if row == NO_BLOCK else row
 
     @property
     def column(self):
-        return self._column
+        column = self._pool.column[self._id]
+        return None if column == NO_BLOCK else column
 
     @property
     def delay(self):
-        return self._delay
+        return self._pool.delay[self._id] == 1
 
     @property
     def fatigue(self):  # TODO: fatigue logic
-        return self._fatigue
+        return self._pool.fatigue[self._id]
 
     @fatigue.setter
     def fatigue(self, value):
-        self._fatigue = value
+        self._pool.fatigue[self._id] = value
+
+    @property
+    def is_star_player(self) -> bool:
+        return self._pool.is_star_player[self._id] == 1
+
+    @is_star_player.setter
+    def is_star_player(self, value: bool):
+        self._pool.is_star_player[self._id] = value
+
+    @property
+    def recorder(self):
+        """the MatchRecorder of the game being played, None when no one listens"""
+        return self._pool.recorders[self._id]
+
+    @recorder.setter
+    def recorder(self, recorder):
+        self._pool.recorders[self._id] = recorder
+
+    # stat tables, built on demand from the counter stores
+    @property
+    def game_table(self):
+        return self._world.game_stats.to_frame([self._id]).reset_index(drop=True)
+
+    @property
+    def season_table(self):
+        return self._world.season_stats.to_frame([self._id]).reset_index(drop=True)
+
+    @property
+    def all_time_stats(self):
+        return self._world.all_time_stats.to_frame([self._id]).reset_index(drop=True)
 
     # disc related methods
     def create_disc(self):
         self.gain_disc()
         self.increment_stat_by("creations", 1)
-        if self.column in [10, 11]:
+        in_end_zone = self.column in [10, 11]
+        if in_end_zone:
             self.increment_stat_by("end_zone_creation", 1)
+        self._emit(EventKind.CREATION, outcome=END_ZONE * in_end_zone)
 
     def gain_disc(self):
-        self._has_disc = True
+        self._pool.has_disc[self._id] = True
 
     def give_disc_away(self):
-        self._has_disc = False
+        self._pool.has_disc[self._id] = False
 
     # field related methods
     def get_on_field(self):
-        self._on_field = True
+        self._pool.on_field[self._id] = True
 
     def get_off_field(self):
-        self._has_disc = False
-        self._on_field = False
-        self._position = None
-        self._has_disc = False
-        self._row = None
-        self._column = None
-        self._delay = False
-        self._fatigue = 0  # TODO: think about the relevant logic
+        pool, i = self._pool, self._id
+        pool.has_disc[i] = False
+        pool.on_field[i] = False
+        pool.position[i] = NO_BLOCK
+        pool.row[i] = NO_BLOCK
+        pool.column[i] = NO_BLOCK
+        pool.delay[i] = False
+        pool.fatigue[i] = 0  # TODO: think about the relevant logic
 
     # row related methods
     def set_row(self, is_left: bool):
         if not self.on_field:
-            self._row = None
+            self._pool.row[self._id] = NO_BLOCK
             return
-        try:
-            self._row = self._position * 2
-        except TypeError:
-            print(f"invalid position for this player - {self.position}")
-        if not is_left:
-            self._row += 1
+        position = self.position
+        if position is None:
+            print(f"invalid position for this player - {position}")
+            raise TypeError
+        self._pool.row[self._id] = position * 2 + (0 if is_left else 1)
 
     def reset_position(self, is_left: bool):
-        self.get_on_field()
-        self.give_disc_away()
+        pool, i = self._pool, self._id
+        pool.on_field[i] = True
+        pool.has_disc[i] = False
         self.set_row(is_left)
-        self._delay_switch_off()
-        if is_left:
-            self._column = 1
-        else:
-            self._column = 20
+        pool.delay[i] = False
+        pool.column[i] = 1 if is_left else 20
 
-    def _determine_blocks(self) -> int:
+    def _determine_blocks(self, rng=random) -> int:
         """randomizes the number of blocks a certain player would advance.
         """
         # TODO: special qualities such as sprinter and slow starter
@@ -311,7 +285,7 @@ class Player:
         if self.delay:
             self._delay_switch_off()
             return 0
-        run_attempt = randint(1, self.speed)
+        run_attempt = rng.randint(1, self.speed)
         if run_attempt > 66:
             advance_blocks = 3
         elif run_attempt > 33:
@@ -320,33 +294,38 @@ class Player:
             advance_blocks = 1
         return advance_blocks
 
-    def advance(self, is_left: bool):
-        original_column = self.column  # TODO: remove later
+    def advance(self, is_left: bool, rng=random):
+        original_column = self.column
         threshold = 10 if is_left else 11
         direction = 1 if is_left else -1
 
-        if self.column == threshold:
+        if original_column == threshold:
             self.increment_stat_by("turns_in_touchdown_strip", 1)
-        elif self._delay:
+            self._emit(EventKind.STRIP)
+        elif self.delay:
             self._delay_switch_off()
         else:
             self.increase_fatigue()
-            distance = abs(self.column - threshold)
-            blocks = self._determine_blocks()
+            distance = abs(original_column - threshold)
+            blocks = self._determine_blocks(rng)
             if distance < blocks:
                 blocks = distance
             self.increment_stat_by("distance_covered", blocks)
-            self._column += blocks * direction
-            if self.is_star_player:
-                print(f"{self.format_name} used to be at {original_column}, and advanced to {self.column}")
+            self._pool.column[self._id] = original_column + blocks * direction
             if self.has_disc:
                 self.increment_stat_by("distance_carried", blocks)
+            self._emit(EventKind.ADVANCE, value=original_column, outcome=HAD_DISC * self.has_disc)
 
-    def touchdown(self):
+    def touchdown(self, is_left: bool):
         self.increment_stat_by("touchdowns", 1)
+        self._emit(EventKind.TOUCHDOWN, outcome=IS_LEFT * is_left)
+
+    def start_set(self, is_left: bool):
+        self.increment_stat_by("sets_played", 1)
+        self._emit(EventKind.LINE_UP, outcome=IS_LEFT * is_left)
 
-    def _determine_retreat(self, shot_quality: int) -> int:
-        balance_attempt = randint(1, self.stability) // 3
+    def _determine_retreat(self, shot_quality: int, rng=random) -> int:
+        balance_attempt = rng.randint(1, self.stability) // 3
         if balance_attempt > shot_quality:
             blocks = 2
         elif balance_attempt == shot_quality:
@@ -355,16 +334,18 @@ class Player:
             blocks = 10
         return blocks
 
-    def retreat(self, shot_quality: int, is_left: bool) -> bool:
-        original_column = self.column  # TODO: remove later
-        blocks = self._determine_retreat(shot_quality)
+    def retreat(self, shot_quality: int, is_left: bool, blocks: int = None, rng=random) -> bool:
+        original_column = self.column
+        had_disc = self.has_disc
+        if blocks is None:
+            blocks = self._determine_retreat(shot_quality, rng)
         there_is_a_takedown = self._check_fall(blocks, is_left)
         if there_is_a_takedown:
             self.fall_down(is_left)
+            self._emit(EventKind.FALL, value=original_column, outcome=HAD_DISC * had_disc)
         else:
             self.absorb(blocks, is_left)
-            if self.is_star_player:
-                print(f"{self.format_name} used to be at {original_column}, and retreated to {self.column}")
+            self._emit(EventKind.ABSORB, value=original_column, outcome=HAD_DISC * had_disc)
         return there_is_a_takedown
 
     # face_off related methods
@@ -372,8 +353,6 @@ class Player:
         self.increment_stat_by("evasions", 1)
         if self.has_disc:
             self.increment_stat_by("carrier_evasions", 1)
-        if self.is_star_player:
-            print(f"{self.format_name} has managed to evade a shot!")
 
     def hit_target(self, target_has_disc: bool, target_column: int):
         self.increment_stat_by("successful_shots", 1)
@@ -381,8 +360,6 @@ class Player:
             self.increment_stat_by("carrier_hits", 1)
             if target_column in [10, 11]:
                 self.increment_stat_by("last_ditch_hits", 1)
-        if self.is_star_player:
-            print(f"{self.format_name} has made a successful shot!")
 
     def takedown(self, target_has_disc: bool, target_column: int):
         self.increment_stat_by("successful_takedowns", 1)
@@ -400,7 +377,6 @@ class Player:
         return False
 
     def fall_down(self, is_left: bool):
-        original_column = self.column
         direction = 1 if is_left else -1
         self.increment_stat_by("hits_taken", 1)
         self.increment_stat_by("balance_losses", 1)
@@ -408,9 +384,7 @@ class Player:
             self.increment_stat_by("drops_made", 1)
         self._delay_switch_on()
         self.reset_position(is_left)
-        self._column -= direction
-        if self.is_star_player:
-            print(f"{self.format_name} used to be at {original_column}, and fell to {self.column}")
+        self._pool.column[self._id] -= direction
 
     def absorb(self, blocks: int, is_left: bool):
         self.increment_stat_by("hits_taken", 1)
@@ -422,24 +396,26 @@ class Player:
             self.increment_stat_by("last_ditch_hits", 1)
         if not is_left:
             blocks *= -1
-        self._column -= blocks
+        self._pool.column[self._id] -= blocks
 
     # fatigue related methods
     def increase_fatigue(self):
-        self._fatigue += 1
+        self._pool.fatigue[self._id] += 1
 
     # delay related methods
     def _delay_switch_on(self):
-        self._delay = True
+        self._pool.delay[self._id] = True
 
     def _delay_switch_off(self):
-        self._delay = False
+        self._pool.delay[self._id] = False
 
     # data manipulation
     def increment_stat_by(self, stat, amount):
-        self.game_table[stat] += amount
+        self._world.game_stats.increment(self._id, stat, amount)
 
-    # TODO: transfer data from game table to other tables
+    def _emit(self, kind: EventKind, target=None, value: int = 0, outcome: int = 0):
+        if self.recorder is not None:
+            self.recorder.emit(kind, self, target, value, outcome)
 
     # passing related methods
     def pass_disc(self, blocks_difference: int):
@@ -460,10 +436,11 @@ class Player:
 
     def dash(self):
         self.increment_stat_by("dashes", 1)
+        self._emit(EventKind.DASH)
 
     # other
     def calculate_distance_to(self, player2) -> float:
-        result = dist((self.row, self.column), (player2.row, player2.column))
+        result = DISTANCES[self.row - player2.row][self.column - player2.column]
         if result == 0:
             print(f"tried to calculate the distance between {self.format_name} and {player2.format_name}. "
                   f"rows were {self.row, player2.row}, columns were {self.column, player2.column}")
@@ -479,8 +456,7 @@ class Player:
         return 0
 
     def distance_to_end_zone(self, is_left: bool):
-        threshold = 10 if is_left else 11
-        return abs(self.column - threshold)
+        return END_ZONE_DISTANCES[is_left][self.column]
 
     @property
     def format_name(self) -> str:  # TODO: use enum
@@ -492,12 +468,17 @@ class Player:
         return "".join([self.color, self.name, COLOR_RESET])
 
     def current_match_stat(self, stat: str):
-        return self.game_table[stat][0]
+        return self._world.game_stats.get(self._id, stat)
+
+    def match_stats(self) -> dict:
+        return dict(zip(STAT_NAMES, self._world.game_stats.row(self._id).tolist()))
+
+    def reset_match_stats(self):
+        self._world.game_stats.clear([self._id])
 
     def present_player_game_stats(self, top_stat_list: list):
-        keys_list = list(self.game_table.keys())
         print(self.format_name)
-        for player_stat in keys_list:
+        for player_stat in STAT_NAMES:
             print(player_stat, end="- ")
             if player_stat in top_stat_list:
                 print(COLOR_DICT["purple"], end="")
@@ -513,64 +494,25 @@ class Player:
     def get_score_from_categories(self, categories, weights):
         return sum([self.current_match_stat(categories[i]) * weights[i] for i in range(len(categories))])
 
+    def _match_scores(self) -> dict:
+        return rating_logic.raw_scores(self._world.game_stats.values[[self._id]])
+
+    def _match_score(self, name: str) -> float:
+        return rating_logic.raw_score(self._world.game_stats.values[[self._id]], name).item(0)
+
     def get_offence_score(self):
-        points_categories = ["touchdowns", "assists"]
-        touchdowns_score = self.get_score_from_categories(points_categories, [1, 0.8])
-        advancement_stats = ["distance_carried", "distance_passed", "advancement_by_catch"]
-        advancement_score = self.get_score_from_categories(advancement_stats, [1, 1, 1])
-        creation_stats = ["creations", "end_zone_creation"]
-        creation_score = self.get_score_from_categories(creation_stats, [1, 2])
-        holding_stats = ["carrier_evasions", "drop_avoidance"]
-        holding_score = self.get_score_from_categories(holding_stats, [10, 1])
-        offence_scores_list = [touchdowns_score, advancement_score, creation_score, holding_score]
-
-        offence_weights = [1, 0.05, 0.2, 0.005]
-        return round(sum([offence_scores_list[i] * offence_weights[i] for i in range(len(offence_scores_list))]), 2)
+        return self._match_score("off")
 
     def get_defence_score(self):
-        defence_categories = ["last_ditch_hits", "last_ditch_takedowns", "carrier_takedowns", "carrier_hits"]
-        defence_weights = [0.5, 1, 0.5, 0.2]
-        return round(self.get_score_from_categories(defence_categories, defence_weights), 2)
+        return self._match_score("def")
 
     def get_fail_score(self):
-        off_fail_categories = ["drops_made", "failed_passes", "failed_catches"]
-        off_fail_weights = [1, 0.4, 0.2]
-        off_fail_score = self.get_score_from_categories(off_fail_categories, off_fail_weights)
-
-        pos_fail_categories = ["hits_taken", "balance_losses"]
-        pos_fail_weights = [0.2, 1]
-        pos_fail_score = self.get_score_from_categories(pos_fail_categories, pos_fail_weights)
-
-        fail_scores_list = [off_fail_score, pos_fail_score]
-        fail_weights = [1, 0.2]
-        return round(sum([fail_scores_list[i] * fail_weights[i] for i in range(len(fail_scores_list))]), 2)
+        return self._match_score("fail")
 
     def get_formation_score(self):
-        positioning_categories = ["distance_covered", "turns_in_touchdown_strip", "evasions", "fall_avoidance"]
-        positioning_weights = [0.25, 1, 0.25, 0.05]
-        positioning_score = self.get_score_from_categories(positioning_categories, positioning_weights)
-
-        pressure_categories = ["successful_shots", "successful_takedowns"]
-        pressure_weights = [0.2, 1]
-        pressure_score = self.get_score_from_categories(pressure_categories, pressure_weights)
-
-        formation_scores_list = [positioning_score, pressure_score]
-        formation_weights = [0.1, 0.2]
-        return round(sum([formation_scores_list[i] * formation_weights[i] for i in range(len(formation_scores_list))]), 2)
+        return self._match_score("form")
 
     def assess_performance(self):
-        def standardize_score(raw: float, mean: float, std: float):
-            z_score = (raw - mean) / std
-            standardized = round(5.5 + z_score * 1.5, 1)
-            if standardized > 10:
-                standardized = 10.0
-            elif standardized < 1:
-                standardized = 1.0
-            return standardized
-
         if self.current_match_stat("sets_played"):
-            offence_score = standardize_score(self.get_offence_score(), 4.88, 3.46)
-            defence_score = standardize_score(self.get_defence_score(), 2.59, 2.38)
-            formation_score = standardize_score(self.get_formation_score(), 8, 1.896)
-            fail_score = standardize_score(self.get_fail_score(), 2.2, 1.53)
-            print("off", offence_score, "def", defence_score, "form", formation_score, "fail", fail_score)
+            ratings = rating_logic.score_rows(rating_logic.standardize(self._match_scores()), 0)
+            print("off", ratings["off"], "def", ratings["def"], "form", ratings["form"], "fail", ratings["fail"])
@@ -0,0 +1,105 @@
+from array import array
+from operator import itemgetter
+from typing import Iterable, List
+
+from numpy import frombuffer
+
+ATTRIBUTE_NAMES = ["speed", "agility", "creating", "shooting", "stability", "distribution", "control", "stamina"]
+NO_BLOCK = -1  # the row, column or position of a player that is off the field
+
+
+class PlayerPool:
+    """
+    The attributes and in-match state of many players, one contiguous typed array per field, indexed by player id.
+
+    a Player is a view of a single slot. the arrays are stdlib arrays, so reading or writing a single slot is as cheap
+    as an attribute, while view() exposes a whole field to numpy without copying it. rows, columns and positions hold
+    NO_BLOCK where a Player would return None, flags hold 0 or 1.
+    """
+    # field: (typecode, value of an empty slot)
+    _FIELDS = dict(**{name: ("h", 0) for name in ATTRIBUTE_NAMES},
+                   roster_id=("i", 0),  # the "ID" of the roster row a player was built from
+                   shirt_number=("h", 0),
+                   value=("i", 0),
+                   position=("b", NO_BLOCK),
+                   row=("b", NO_BLOCK),
+                   column=("b", NO_BLOCK),
+                   has_disc=("B", 0),
+                   on_field=("B", 0),
+                   delay=("B", 0),
+                   fatigue=("i", 0),
+                   is_star_player=("B", 0))
+
+    def __init__(self):
+        for name, (typecode, _) in PlayerPool._FIELDS.items():
+            setattr(self, name, array(typecode))
+        # per player objects
+        self.names: List[str] = []
+        self.teams: List[str] = []
+        self.color_names: List[str] = []
+        self.recorders: list = []  # the MatchRecorder listening to a player, or None
+
+    def __len__(self):
+        return len(self.speed)
+
+    def add(self, record: dict) -> int:
+        """
+        adds a player built from a roster row.
+
+        :return: the new player's slot
+        """
+        slot = len(self)
+        for name in ATTRIBUTE_NAMES:
+            getattr(self, name).append(record[name])
+        self.roster_id.append(record.get("ID", slot))
+        self.shirt_number.append(record.get("Shirt number", 0))
+        for name in ("value", "position", "row", "column", "has_disc", "on_field", "delay", "fatigue",
+                     "is_star_player"):
+            getattr(self, name).append(PlayerPool._FIELDS[name][1])
+        self.names.append(record["Name"])
+        self.teams.append(record["Team"])
+        self.color_names.append(record["Color"])
+        self.recorders.append(None)
+        return slot
+
+    def record(self, slot: int) -> dict:
+        """:return: the roster row the player in slot was built from"""
+        record = {"ID": self.roster_id[slot], "Name": self.names[slot], "Team": self.teams[slot],
+                  "Color": self.color_names[slot], "Shirt number": self.shirt_number[slot]}
+        for name in ATTRIBUTE_NAMES:
+            record[name] = getattr(self, name)[slot]
+        return record
+
+    def clear(self):
+        """removes every player."""
+        for name in PlayerPool._FIELDS:
+            del getattr(self, name)[:]
+        self.names.clear()
+        self.teams.clear()
+        self.color_names.clear()
+        self.recorders.clear()
+
+    # whole-column access
+    def view(self, name: str):
+        """
+        :return: a numpy array sharing the memory of a whole field, writes go through to the players. the pool
+        cannot add or clear players while a view is alive, so do not keep one around.
+        """
+        return frombuffer(getattr(self, name), dtype=getattr(self, name).typecode)
+
+    def columns(self, slots: Iterable[int]) -> list:
+        return list(self._gather("column", slots))
+
+    def positions(self, slots: Iterable[int]) -> list:
+        """:return: list of (row, column) of every slot"""
+        return list(zip(self._gather("row", slots), self._gather("column", slots)))
+
+    def _gather(self, name: str, slots: Iterable[int]) -> tuple:
+        slots = tuple(slots)
+        if len(slots) == 1:
+            return getattr(self, name)[slots[0]],
+        return itemgetter(*slots)(getattr(self, name)) if slots else ()
+
+    def nbytes(self) -> int:
+        """the bytes the arrays take per player."""
+        return sum(getattr(self, name).itemsize for name in PlayerPool._FIELDS)
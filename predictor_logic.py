@@ -0,0 +1,259 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from math import sqrt
+from os import cpu_count
+from typing import Dict, Iterator, List, Tuple, Union
+
+from numpy import zeros, float64
+from numpy.random import SeedSequence
+
+from game_class import Game
+from player_class import Player
+from rng_logic import MatchRandom, spawn_seeds
+from stats_class import STAT_NAMES
+from team_class import Team
+from world_class import World
+
+Z_95 = 1.96  # z value of a two-sided 95% confidence interval
+
+_worker_world: Union[World, None] = None  # the players and teams rebuilt inside this worker process
+_worker_teams: Dict[tuple, Tuple[list, Team]] = {}  # the records and team of every team rebuilt in this process
+
+
+def init_worker():
+    """the initializer of a worker process, gives it a world and a team cache of its own."""
+    global _worker_world, _worker_teams
+    _worker_world = World()
+    _worker_teams = {}
+
+
+def snapshot_team(team: Team) -> dict:
+    """
+    packs a team into plain data that can be sent to a worker process.
+
+    :return: dict of the team's name, color, default roster player ids and the roster rows of those players
+    """
+    players = [team.world.get_player(i) for i in team.default_starting_roster_ids]
+    return {
+        "name": team.name,
+        "color": team.color,
+        "player_ids": [player.get_id for player in players],
+        "records": [player.record for player in players]
+    }
+
+
+def _rebuild_team(snapshot: dict) -> Team:
+    if _worker_world is None:
+        init_worker()  # called in this process, not in a pool's worker
+    key = (snapshot["name"], tuple(snapshot["player_ids"]))
+    cached = _worker_teams.get(key)
+    if cached is None or cached[0] != snapshot["records"]:
+        indexes = [Player(record, _worker_world).get_id for record in snapshot["records"]]
+        cached = snapshot["records"], Team(snapshot["name"], snapshot["color"], indexes, _worker_world)
+        _worker_teams[key] = cached
+    return cached[1]
+
+
+def _original_ids(left_snapshot: dict, right_snapshot: dict) -> Dict[int, int]:
+    original_ids = {}
+    for snapshot in (left_snapshot, right_snapshot):
+        team = _rebuild_team(snapshot)
+        for original_id, player_index in zip(snapshot["player_ids"], team.default_starting_roster_ids):
+            original_ids[player_index] = original_id
+    return original_ids
+
+
+def _simulate_rebuilt_match(left_snapshot: dict, right_snapshot: dict, original_ids: Dict[int, int],
+                            seed_sequence: SeedSequence) -> dict:
+    left_team = _rebuild_team(left_snapshot)
+    right_team = _rebuild_team(right_snapshot)
+    for team in (left_team, right_team):
+        team.reset_roster()
+    summary = Game(left_team, right_team, headless=True, rng=MatchRandom(seed_sequence)).simulate()
+    summary["players"] = {original_ids[player_id]: stats for player_id, stats in summary["players"].items()}
+    return summary
+
+
+def simulate_match(left_snapshot: dict, right_snapshot: dict, seed_sequence: SeedSequence) -> dict:
+    """
+    runs a single headless match between two snapshotted teams, on the random stream of seed_sequence.
+
+    :return: the match summary, with the players keyed by their ids in the calling process
+    """
+    return _simulate_rebuilt_match(left_snapshot, right_snapshot, _original_ids(left_snapshot, right_snapshot),
+                                   seed_sequence)
+
+
+def simulate_chunk(left_snapshot: dict, right_snapshot: dict, num_of_matches: int,
+                   seed_sequence: SeedSequence) -> dict:
+    """
+    runs headless matches between two snapshotted teams and sums up their results.
+    every match gets its own random stream, spawned from seed_sequence.
+
+    :return: dict of sums that MatchPrediction.merge can fold in
+    """
+    original_ids = _original_ids(left_snapshot, right_snapshot)
+
+    stat_sums = {original_id: zeros(len(STAT_NAMES), dtype=float64) for original_id in original_ids.values()}
+    stat_squares = {original_id: zeros(len(STAT_NAMES), dtype=float64) for original_id in original_ids.values()}
+    left_wins = 0
+    scores = Counter()
+    totals = {"sets": 0, "phases": 0, "turns": 0}
+    for match_seed in spawn_seeds(seed_sequence, num_of_matches):
+        summary = _simulate_rebuilt_match(left_snapshot, right_snapshot, original_ids, match_seed)
+        left_wins += summary["left score"] > summary["right score"]
+        scores[(summary["left score"], summary["right score"])] += 1
+        for key in totals:
+            totals[key] += summary[key]
+        for player_id, stats in summary["players"].items():
+            values = [stats[stat] for stat in STAT_NAMES]
+            stat_sums[player_id] += values
+            stat_squares[player_id] += [value * value for value in values]
+
+    return {
+        "matches": num_of_matches,
+        "left wins": left_wins,
+        "scores": scores,
+        "totals": totals,
+        "stat sums": stat_sums,
+        "stat squares": stat_squares
+    }
+
+
+class MatchPrediction:
+    """Running estimate of a match-up, built from chunks of simulated matches."""
+
+    def __init__(self, left_team_name: str, right_team_name: str):
+        self._left_team_name = left_team_name
+        self._right_team_name = right_team_name
+        self._matches = 0
+        self._left_wins = 0
+        self._scores = Counter()
+        self._totals = {"sets": 0, "phases": 0, "turns": 0}
+        self._stat_sums = {}
+        self._stat_squares = {}
+
+    @property
+    def matches(self):
+        return self._matches
+
+    @property
+    def left_team_name(self):
+        return self._left_team_name
+
+    @property
+    def right_team_name(self):
+        return self._right_team_name
+
+    def merge(self, chunk: dict):
+        self._matches += chunk["matches"]
+        self._left_wins += chunk["left wins"]
+        self._scores.update(chunk["scores"])
+        for key, value in chunk["totals"].items():
+            self._totals[key] += value
+        for player_id, sums in chunk["stat sums"].items():
+            if player_id in self._stat_sums:
+                self._stat_sums[player_id] += sums
+                self._stat_squares[player_id] += chunk["stat squares"][player_id]
+            else:
+                self._stat_sums[player_id] = sums.copy()
+                self._stat_squares[player_id] = chunk["stat squares"][player_id].copy()
+
+    @property
+    def left_win_probability(self) -> float:
+        return self._left_wins / self._matches if self._matches else 0.0
+
+    @property
+    def right_win_probability(self) -> float:
+        return 1 - self.left_win_probability if self._matches else 0.0
+
+    @property
+    def margin(self) -> float:
+        """half the width of the 95% confidence interval of the win probability."""
+        if not self._matches:
+            return 1.0
+        probability = self.left_win_probability
+        return Z_95 * sqrt(probability * (1 - probability) / self._matches)
+
+    @property
+    def score_distribution(self) -> Dict[Tuple[int, int], float]:
+        """the share of matches that ended in every final (left, right) score."""
+        return {score: count / self._matches for score, count in sorted(self._scores.items())}
+
+    @property
+    def average_sets(self) -> float:
+        return self._totals["sets"] / self._matches if self._matches else 0.0
+
+    @property
+    def average_phases(self) -> float:
+        return self._totals["phases"] / self._matches if self._matches else 0.0
+
+    @property
+    def average_turns(self) -> float:
+        return self._totals["turns"] / self._matches if self._matches else 0.0
+
+    def player_stat_means(self) -> Dict[int, Dict[str, Tuple[float, float, float]]]:
+        """
+        averages every player's stats per match.
+
+        :return: dict of player id to a dict of stat to (mean, lower bound, upper bound) of a 95% confidence interval
+        """
+        result = {}
+        for player_id, sums in self._stat_sums.items():
+            means = sums / self._matches
+            variances = (self._stat_squares[player_id] / self._matches - means ** 2).clip(min=0)
+            if self._matches > 1:
+                variances *= self._matches / (self._matches - 1)
+            margins = Z_95 * (variances / self._matches) ** 0.5
+            result[player_id] = {stat: (mean, mean - margin, mean + margin)
+                                 for stat, mean, margin in zip(STAT_NAMES, means.tolist(), margins.tolist())}
+        return result
+
+
+def predict_match(left_team: Team, right_team: Team, num_of_matches: int, chunk_size: int = 50,
+                  seed: Union[int, None] = None, workers: Union[int, None] = None) -> Iterator[MatchPrediction]:
+    """
+    simulates num_of_matches headless matches across a process pool.
+
+    every chunk of matches runs on its own random stream spawned from seed, so a seeded prediction is repeatable.
+    a prediction is yielded each time a chunk is merged, the caller may stop iterating once it is tight enough.
+
+    :return: generator of the running MatchPrediction
+    """
+    if chunk_size < 1:
+        print(f"chunk_size must be at least 1, got {chunk_size}")
+        raise ValueError(chunk_size)
+    if num_of_matches < 1:
+        print(f"num_of_matches must be at least 1, got {num_of_matches}")
+        raise ValueError(num_of_matches)
+    left_snapshot = snapshot_team(left_team)
+    right_snapshot = snapshot_team(right_team)
+    chunk_sizes: List[int] = [chunk_size] * (num_of_matches // chunk_size)
+    if num_of_matches % chunk_size:
+        chunk_sizes.append(num_of_matches % chunk_size)
+    seed_sequences = spawn_seeds(seed, len(chunk_sizes))
+    workers = workers or cpu_count() or 1
+
+    prediction = MatchPrediction(left_team.name, right_team.name)
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker)
+    pending = set()
+    next_chunk = 0
+    try:
+        while next_chunk < len(chunk_sizes) or pending:
+            while next_chunk < len(chunk_sizes) and len(pending) < workers * 2:
+                pending.add(executor.submit(simulate_chunk, left_snapshot, right_snapshot,
+                                            chunk_sizes[next_chunk], seed_sequences[next_chunk]))
+                next_chunk += 1
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                prediction.merge(future.result())
+                yield prediction
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def predict(left_team: Team, right_team: Team, num_of_matches: int, chunk_size: int = 50,
+            seed: Union[int, None] = None, workers: Union[int, None] = None) -> MatchPrediction:
+    for prediction in predict_match(left_team, right_team, num_of_matches, chunk_size, seed, workers):
+        pass
+    return prediction
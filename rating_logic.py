@@ -0,0 +1,142 @@
+import json
+from os.path import getmtime
+from typing import Dict, List, Tuple
+
+from numpy import asarray, float64, rint
+
+from constants import RATING_PROFILE_PATH
+from stats_class import STAT_INDEX
+
+SCORE_NAMES = ["off", "def", "form", "fail"]
+
+# every score is a weighted sum of groups, and every group a weighted sum of stats, both in this order
+RATING_SCHEMA: Dict[str, Tuple[List[Tuple[List[str], list]], list]] = {
+    "off": ([
+        (["touchdowns", "assists"], [1, 0.8]),  # points
+        (["distance_carried", "distance_passed", "advancement_by_catch"], [1, 1, 1]),  # advancement
+        (["creations", "end_zone_creation"], [1, 2]),  # creation
+        (["carrier_evasions", "drop_avoidance"], [10, 1])  # holding
+    ], [1, 0.05, 0.2, 0.005]),
+    "def": ([
+        (["last_ditch_hits", "last_ditch_takedowns", "carrier_takedowns", "carrier_hits"], [0.5, 1, 0.5, 0.2])
+    ], [1]),
+    "form": ([
+        (["distance_covered", "turns_in_touchdown_strip", "evasions", "fall_avoidance"], [0.25, 1, 0.25, 0.05]),
+        (["successful_shots", "successful_takedowns"], [0.2, 1])  # pressure
+    ], [0.1, 0.2]),
+    "fail": ([
+        (["drops_made", "failed_passes", "failed_catches"], [1, 0.4, 0.2]),  # offensive fails
+        (["hits_taken", "balance_losses"], [0.2, 1])  # positioning fails
+    ], [1, 0.2])
+}
+
+# mean and standard deviation of every raw score, used to standardize it until a calibrated profile exists
+NORMALIZATION: Dict[str, Tuple[float, float]] = {
+    "off": (4.88, 3.46),
+    "def": (2.59, 2.38),
+    "form": (8, 1.896),
+    "fail": (2.2, 1.53)
+}
+
+
+_profiles: Dict[str, Tuple[float, Dict[str, Tuple[float, float]]]] = {}  # path to (mtime, normalization)
+
+
+def load_normalization(path: str = RATING_PROFILE_PATH) -> Dict[str, Tuple[float, float]]:
+    """
+    reads the normalization profile written by calibration_logic.write_profile. a profile is read again only after
+    its file changed.
+
+    :return: dict of every score name to its (mean, standard deviation), NORMALIZATION when there is no usable profile
+    """
+    try:
+        mtime = getmtime(path)
+    except OSError:
+        return NORMALIZATION
+    cached = _profiles.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    try:
+        with open(path) as file:
+            profile = json.load(file)
+        normalization = {name: (float(profile["scores"][name]["mean"]), float(profile["scores"][name]["std"]))
+                         for name in SCORE_NAMES}
+        if not all(std > 0 for _, std in normalization.values()):
+            raise ValueError("non positive standard deviation")
+    except (OSError, ValueError, KeyError, TypeError) as error:
+        print(f"could not use the rating profile {path} ({error}), the default normalization is used")
+        normalization = NORMALIZATION
+    _profiles[path] = (mtime, normalization)
+    return normalization
+
+
+def _weighted_sum(values: list, weights: list):
+    """sums in the order of values, from 0, like sum([value * weight ...]) does. values may be arrays."""
+    total = 0
+    for value, weight in zip(values, weights):
+        total = total + value * weight
+    return total
+
+
+def _round(values, digits: int):
+    """
+    rounds like round() of a numpy float does (the per-player formulas summed numpy counters), that is
+    rint(value * 10 ** digits) / 10 ** digits, which is not always what round() of a python float gives.
+    """
+    scale = 10.0 ** digits
+    return rint(asarray(values, dtype=float64) * scale) / scale
+
+
+def raw_scores(stats) -> Dict[str, object]:
+    """
+    rates many players at once.
+
+    the columns are accumulated one at a time, in the order of RATING_SCHEMA, rather than in a single matrix
+    product whose summation order is up to BLAS, so every score is exactly what the per-player formulas give.
+
+    :param stats: array of shape (players, len(STAT_NAMES)), one row of counters per player
+    :return: dict of every score name to an array of that score per player, rounded to 2 digits
+    """
+    stats = asarray(stats)
+    return {name: raw_score(stats, name) for name in SCORE_NAMES}
+
+
+def raw_score(stats, name: str):
+    """
+    raw_scores of a single score, for callers that need only that one.
+
+    :return: array of the score per row of stats, rounded to 2 digits
+    """
+    stats = asarray(stats)
+    groups, weights = RATING_SCHEMA[name]
+    group_scores = [_weighted_sum([stats[:, STAT_INDEX[stat]] for stat in categories], category_weights)
+                    for categories, category_weights in groups]
+    return _round(_weighted_sum(group_scores, weights), 2)
+
+
+def standardize(scores: Dict[str, object], normalization: Dict[str, Tuple[float, float]] = None
+                ) -> Dict[str, object]:
+    """
+    :param scores: raw scores as returned by raw_scores
+    :param normalization: mean and standard deviation of every score, the calibrated profile (see
+    load_normalization) by default
+    :return: dict of every score name to an array of standardized scores, from 1 to 10
+    """
+    normalization = normalization if normalization is not None else load_normalization()
+    standardized = {}
+    for name in SCORE_NAMES:
+        mean, std = normalization[name]
+        z_scores = (scores[name] - mean) / std
+        standardized[name] = _round(5.5 + z_scores * 1.5, 1).clip(1.0, 10.0)
+    return standardized
+
+
+def rate(stats) -> Tuple[Dict[str, object], Dict[str, object]]:
+    """:return: the raw scores and the standardized scores of every row of stats"""
+    scores = raw_scores(stats)
+    return scores, standardize(scores)
+
+
+def score_rows(scores: Dict[str, object], row: int) -> Dict[str, float]:
+    """:return: dict of every score name to its value in the given row"""
+    return {name: scores[name].item(row) for name in SCORE_NAMES}
@@ -0,0 +1,120 @@
+import sys
+from typing import List, Tuple, Union
+
+from constants import Color, paint
+
+CLEAR_SCREEN = "\033[2J\033[H"
+ERASE_LINE = "\033[K"
+ERASE_BELOW = "\033[J"
+FIELD_TOP = 2  # the screen line of the field's first row, the line above it is left blank
+
+Cell = Tuple[str, Color]  # the character drawn in a block and its color
+
+
+def move_cursor(line: int, column: int) -> str:
+    return f"\033[{line};{column}H"
+
+
+class WatchedStream:
+    """A text stream that counts the characters written through it, so a renderer can tell that others printed."""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self.written = 0
+
+    @property
+    def stream(self):
+        return self._stream
+
+    def write(self, text: str) -> int:
+        self.written += len(text)
+        return self._stream.write(text)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class FrameRenderer:
+    """
+    Draws frames of the field and the lines under it, keeping the last frame drawn.
+
+    only the blocks and lines that changed since that frame are rewritten (by cursor positioning), and every frame
+    goes out in a single write, so redrawing the match costs no shell process and does not flicker.
+
+    the positions hold only while nothing else moved the screen. the renderer writes through a WatchedStream (it
+    wraps sys.stdout in one until release), so anything printed since the last frame (events, prompts) is noticed,
+    and the next frame is drawn whole from a cleared screen.
+    """
+
+    def __init__(self, stream=None):
+        self._stream: Union[WatchedStream, None] = WatchedStream(stream) if stream is not None else None
+        self._cells: Union[List[List[Cell]], None] = None
+        self._lines: Union[List[str], None] = None
+        self._written = 0  # the characters the stream had written right after the last frame
+
+    def invalidate(self):
+        """forgets the last frame, so the next one is drawn from a cleared screen."""
+        self._cells = None
+        self._lines = None
+
+    def _watched_stream(self) -> WatchedStream:
+        """:return: the given stream, or sys.stdout, wrapped in a WatchedStream the first time it is seen"""
+        if self._stream is not None:
+            return self._stream
+        if not isinstance(sys.stdout, WatchedStream):
+            sys.stdout = WatchedStream(sys.stdout)
+            self.invalidate()
+        return sys.stdout
+
+    def release(self):
+        """puts back the sys.stdout the renderer wrapped, if it is still the current one."""
+        if self._stream is None and isinstance(sys.stdout, WatchedStream):
+            sys.stdout = sys.stdout.stream
+        self.invalidate()
+
+    def _full_frame(self, cells: List[List[Cell]], lines: List[str]) -> List[str]:
+        buffer = [CLEAR_SCREEN, "\n"]
+        for row in cells:
+            buffer.append("|".join(paint(text, color) for text, color in row))
+            buffer.append("\n")
+        for line in lines:
+            buffer.append(line)
+            buffer.append("\n")
+        return buffer
+
+    def _changes(self, cells: List[List[Cell]], lines: List[str]) -> List[str]:
+        buffer = []
+        for row_index, (row, last_row) in enumerate(zip(cells, self._cells)):
+            for column_index, (cell, last_cell) in enumerate(zip(row, last_row)):
+                if cell != last_cell and not (cell[0] == last_cell[0] == " "):  # blanks look the same in any color
+                    buffer.append(move_cursor(FIELD_TOP + row_index, column_index * 2 + 1))
+                    buffer.append(paint(*cell))
+        lines_top = FIELD_TOP + len(cells)
+        for line_index, line in enumerate(lines):
+            if line_index >= len(self._lines) or line != self._lines[line_index]:
+                buffer.append(move_cursor(lines_top + line_index, 1))
+                buffer.append(line)
+                buffer.append(ERASE_LINE)
+        buffer.append(move_cursor(lines_top + len(lines), 1))
+        return buffer
+
+    def draw(self, cells: List[List[Cell]], lines: List[str]):
+        """
+        draws a frame and leaves the cursor on a cleared line right under it.
+
+        :param cells: the field, one list of (character, color) per row
+        :param lines: the text lines shown under the field
+        """
+        stream = self._watched_stream()
+        if stream.written != self._written:
+            self.invalidate()  # something else printed, the screen may have scrolled under the last frame
+        if self._cells is None or len(cells) != len(self._cells) or len(lines) < len(self._lines):
+            buffer = self._full_frame(cells, lines)
+        else:
+            buffer = self._changes(cells, lines)
+        buffer.append(ERASE_BELOW)
+        stream.write("".join(buffer))
+        stream.flush()
+        self._written = stream.written
+        self._cells = [list(row) for row in cells]
+        self._lines = list(lines)
@@ -0,0 +1,174 @@
+from typing import Dict, Iterable, Iterator, List, NamedTuple
+
+from numpy import zeros, int64
+
+from events_class import EventKind, MatchEvent, read_events, HAD_DISC, END_ZONE, SUCCESS, IS_LEFT
+from field_class import END_ZONE_DISTANCES
+from rating_logic import rate, score_rows
+from stats_class import STAT_NAMES, STAT_INDEX
+
+
+class MatchReplay(NamedTuple):
+    game_id: int
+    left_team_id: int
+    right_team_id: int
+    left_score: int
+    right_score: int
+    stats: Dict[int, Dict[str, int]]  # player id to stat to value, for every player that appears in the match
+    scores: Dict[int, Dict[str, float]]  # player id to the raw offence, defence, formation and fail scores
+    ratings: Dict[int, Dict[str, float]]  # player id to the standardized scores, for players that played a set
+
+
+_SETS_PLAYED = STAT_INDEX["sets_played"]
+_TOUCHDOWNS = STAT_INDEX["touchdowns"]
+_DISTANCE_CARRIED = STAT_INDEX["distance_carried"]
+_DISTANCE_PASSED = STAT_INDEX["distance_passed"]
+_ADVANCEMENT_BY_CATCH = STAT_INDEX["advancement_by_catch"]
+_CREATIONS = STAT_INDEX["creations"]
+_END_ZONE_CREATION = STAT_INDEX["end_zone_creation"]
+_CARRIER_EVASIONS = STAT_INDEX["carrier_evasions"]
+_DROP_AVOIDANCE = STAT_INDEX["drop_avoidance"]
+_LAST_DITCH_HITS = STAT_INDEX["last_ditch_hits"]
+_LAST_DITCH_TAKEDOWNS = STAT_INDEX["last_ditch_takedowns"]
+_CARRIER_TAKEDOWNS = STAT_INDEX["carrier_takedowns"]
+_CARRIER_HITS = STAT_INDEX["carrier_hits"]
+_DISTANCE_COVERED = STAT_INDEX["distance_covered"]
+_TURNS_IN_TOUCHDOWN_STRIP = STAT_INDEX["turns_in_touchdown_strip"]
+_EVASIONS = STAT_INDEX["evasions"]
+_FALL_AVOIDANCE = STAT_INDEX["fall_avoidance"]
+_SUCCESSFUL_SHOTS = STAT_INDEX["successful_shots"]
+_SUCCESSFUL_TAKEDOWNS = STAT_INDEX["successful_takedowns"]
+_DROPS_MADE = STAT_INDEX["drops_made"]
+_FAILED_PASSES = STAT_INDEX["failed_passes"]
+_FAILED_CATCHES = STAT_INDEX["failed_catches"]
+_HITS_TAKEN = STAT_INDEX["hits_taken"]
+_BALANCE_LOSSES = STAT_INDEX["balance_losses"]
+_PASSES_MADE = STAT_INDEX["passes_made"]
+_CATCHES_MADE = STAT_INDEX["catches_made"]
+_DASHES = STAT_INDEX["dashes"]
+
+
+def _finish_match(start: MatchEvent, counters: Dict[int, List[int]], left_score: int, right_score: int
+                  ) -> MatchReplay:
+    stats = {player_id: dict(zip(STAT_NAMES, row)) for player_id, row in counters.items()}
+    raw, standardized = rate(list(counters.values()) or zeros((0, len(STAT_NAMES)), dtype=int64))
+    scores = {}
+    ratings = {}
+    for i, (player_id, player_stats) in enumerate(stats.items()):
+        scores[player_id] = score_rows(raw, i)
+        if player_stats["sets_played"]:
+            ratings[player_id] = score_rows(standardized, i)
+    return MatchReplay(start.value, start.actor, start.target, left_score, right_score, stats, scores, ratings)
+
+
+def replay_matches(events: Iterable[MatchEvent]) -> Iterator[MatchReplay]:
+    """
+    recomputes the match stats of every player, and the scores rated from them, out of a recorded event stream.
+
+    the stream is read once, holding the counters of a single match at a time, so a whole archive can be rescored
+    without simulating. the counting mirrors the Player methods that count during a game.
+
+    :param events: MatchEvents as written by a MatchRecorder, e.g. read_events(path)
+    :return: generator of a MatchReplay per match, in the order the matches end in the stream
+    """
+    width = len(STAT_NAMES)
+    counters: Dict[int, List[int]] = {}
+    start = None
+    left_score = right_score = 0
+
+    def row(player_id: int) -> List[int]:
+        player_row = counters.get(player_id)
+        if player_row is None:
+            player_row = counters[player_id] = [0] * width
+        return player_row
+
+    for event in events:
+        kind = event.kind
+        outcome = event.outcome
+        if kind == EventKind.ADVANCE:
+            blocks = abs(event.actor_column - event.value)
+            actor = row(event.actor)
+            actor[_DISTANCE_COVERED] += blocks
+            if outcome & HAD_DISC:
+                actor[_DISTANCE_CARRIED] += blocks
+        elif kind == EventKind.EVASION:
+            target = row(event.target)
+            target[_EVASIONS] += 1
+            if outcome & HAD_DISC:
+                target[_CARRIER_EVASIONS] += 1
+        elif kind == EventKind.STRIP:
+            row(event.actor)[_TURNS_IN_TOUCHDOWN_STRIP] += 1
+        elif kind == EventKind.LINE_UP:
+            row(event.actor)[_SETS_PLAYED] += 1
+        elif kind == EventKind.HIT:
+            actor = row(event.actor)
+            actor[_SUCCESSFUL_SHOTS] += 1
+            if outcome & HAD_DISC:
+                actor[_CARRIER_HITS] += 1
+                if outcome & END_ZONE:
+                    actor[_LAST_DITCH_HITS] += 1
+        elif kind == EventKind.TAKEDOWN:
+            actor = row(event.actor)
+            actor[_SUCCESSFUL_TAKEDOWNS] += 1
+            if outcome & HAD_DISC:
+                actor[_CARRIER_TAKEDOWNS] += 1
+                if outcome & END_ZONE:
+                    actor[_LAST_DITCH_TAKEDOWNS] += 1
+        elif kind == EventKind.FALL:
+            actor = row(event.actor)
+            actor[_HITS_TAKEN] += 1
+            actor[_BALANCE_LOSSES] += 1
+            if outcome & HAD_DISC:
+                actor[_DROPS_MADE] += 1
+        elif kind == EventKind.ABSORB:
+            original_column = event.value
+            is_left = event.actor_column < original_column  # a left player retreats towards column 0
+            blocks = abs(original_column - event.actor_column)
+            fall_avoidance = 10 - END_ZONE_DISTANCES[is_left][original_column] - blocks
+            actor = row(event.actor)
+            actor[_HITS_TAKEN] += 1
+            actor[_FALL_AVOIDANCE] += fall_avoidance
+            if outcome & HAD_DISC:
+                actor[_DROP_AVOIDANCE] += fall_avoidance
+                if original_column in [10, 11]:
+                    actor[_LAST_DITCH_HITS] += 1
+        elif kind == EventKind.CREATION:
+            actor = row(event.actor)
+            actor[_CREATIONS] += 1
+            if outcome & END_ZONE:
+                actor[_END_ZONE_CREATION] += 1
+        elif kind == EventKind.PASS:
+            passer = row(event.actor)
+            catcher = row(event.target)
+            if outcome & SUCCESS:
+                passer[_PASSES_MADE] += 1
+                passer[_DISTANCE_PASSED] += event.value
+                catcher[_CATCHES_MADE] += 1
+                catcher[_ADVANCEMENT_BY_CATCH] += event.value
+            else:
+                passer[_FAILED_PASSES] += 1
+                catcher[_FAILED_CATCHES] += 1
+        elif kind == EventKind.DASH:
+            row(event.actor)[_DASHES] += 1
+        elif kind == EventKind.TOUCHDOWN:
+            row(event.actor)[_TOUCHDOWNS] += 1
+            if outcome & IS_LEFT:
+                left_score += 1
+            else:
+                right_score += 1
+        elif kind == EventKind.MATCH_START:
+            start = event
+            counters = {}
+            left_score = right_score = 0
+        elif kind == EventKind.MATCH_END:
+            if start is None:
+                print(f"the match of game {event.value} ended but its start was not in the stream")
+                raise ValueError
+            yield _finish_match(start, counters, left_score, right_score)
+            start = None
+            counters = {}
+
+
+def replay_file(path: str) -> Iterator[MatchReplay]:
+    """replay_matches over an event file written by a BinaryEventSink."""
+    return replay_matches(read_events(path))
@@ -0,0 +1,34 @@
+from random import Random
+from typing import List, Union
+
+from numpy import uint64
+from numpy.random import SeedSequence, default_rng
+
+Seed = Union[int, SeedSequence, None]
+
+
+class MatchRandom(Random):
+    """
+    The random stream of a single match.
+
+    single draws use the methods of the random module (randint, choices, random...), arrays of draws come from a
+    NumPy generator. both are seeded from one SeedSequence, so a seed replays the whole match exactly.
+    """
+
+    def __init__(self, seed: Seed = None):
+        seed_sequence = seed if isinstance(seed, SeedSequence) else SeedSequence(seed)
+        scalar_sequence, array_sequence = seed_sequence.spawn(2)
+        self._generator = default_rng(array_sequence)
+        super().__init__(int(scalar_sequence.generate_state(1, dtype=uint64)[0]))
+
+    def random_array(self, shape):
+        """:return: array of the given shape of uniform draws in [0, 1)"""
+        return self._generator.random(shape)
+
+
+def spawn_seeds(root_seed: Seed, num_of_streams: int) -> List[SeedSequence]:
+    """
+    :return: num_of_streams statistically independent seeds, the same ones for the same root seed
+    """
+    root = root_seed if isinstance(root_seed, SeedSequence) else SeedSequence(root_seed)
+    return root.spawn(num_of_streams)
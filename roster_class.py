@@ -0,0 +1,48 @@
+from os import path as os_path
+from typing import List, Union
+
+from constants import PLAYERS_PATH
+
+
+class RosterRepository:
+    """Keeps the players file (a workbook or its binary copy) in memory, reloading it only when it changes on disk."""
+    _default = None  # Static shared repository for the default players file
+
+    def __init__(self, path: str = PLAYERS_PATH):
+        self._path: str = path
+        self._records: Union[List[dict], None] = None
+        self._mtime: Union[float, None] = None
+
+    @classmethod
+    def default(cls):
+        """Class method to retrieve the shared repository of PLAYERS_PATH."""
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def records(self) -> List[dict]:
+        mtime = os_path.getmtime(self._path)
+        if self._records is None or mtime != self._mtime:
+            from data import import_player_records  # pandas is only needed to read the file
+            self._records = import_player_records(self._path)
+            self._mtime = mtime
+        return self._records
+
+    def __len__(self):
+        return len(self.records)
+
+    def get_record(self, player_id: int) -> dict:
+        try:
+            return self.records[player_id]
+        except IndexError:
+            print(f"there is no player with the id {player_id} in {self._path}")
+            raise
+
+    def invalidate(self):
+        self._records = None
+        self._mtime = None
@@ -0,0 +1,113 @@
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count
+from typing import List, Tuple, Union
+
+from constants import NUM_OF_TEAMS
+from predictor_logic import snapshot_team, simulate_match
+from rng_logic import spawn_seeds
+from standings_class import Standings
+from team_class import Team
+
+Fixture = Tuple[int, int]  # indexes of the left and right team
+
+
+def round_robin_schedule(num_of_teams: int = NUM_OF_TEAMS, legs: int = 1) -> List[List[Fixture]]:
+    """
+    schedules every team against every other team with the circle method.
+
+    with an odd number of teams one team rests every round. every other leg repeats the first with the sides switched.
+
+    :return: list of rounds, every round a list of (left team index, right team index)
+    """
+    teams: List[Union[int, None]] = list(range(num_of_teams))
+    if num_of_teams % 2:
+        teams.append(None)
+    rounds = []
+    for round_num in range(len(teams) - 1):
+        fixtures = []
+        for i in range(len(teams) // 2):
+            first, second = teams[i], teams[-1 - i]
+            if first is None or second is None:
+                continue
+            fixtures.append((first, second) if (round_num + i) % 2 == 0 else (second, first))
+        rounds.append(fixtures)
+        teams = [teams[0]] + [teams[-1]] + teams[1:-1]
+    first_leg = rounds[:]
+    switched_leg = [[(right, left) for left, right in fixtures] for fixtures in first_leg]
+    for leg in range(1, legs):
+        rounds.extend(switched_leg if leg % 2 else first_leg)
+    return rounds
+
+
+class Season:
+    """A league season: a round-robin schedule whose rounds are played in parallel worker processes."""
+
+    def __init__(self, teams: List[Team], seed: Union[int, None] = None, legs: int = 1,
+                 workers: Union[int, None] = None):
+        self._teams = teams
+        self._world = teams[0].world  # the season's stats are counted in the world of its teams
+        self._schedule = round_robin_schedule(len(teams), legs)
+        self._standings = Standings()
+        for team_index, team in enumerate(teams):
+            self._standings.add_team(team_index, team.name, team.color.value)
+        num_of_matches = sum(len(fixtures) for fixtures in self._schedule)
+        self._seed_sequences = spawn_seeds(seed, num_of_matches)
+        self._workers = workers or cpu_count() or 1
+        self._round_counter = 0
+        self._match_counter = 0
+        self._results: List[dict] = []
+        self._world.reset_season_stats()
+
+    @property
+    def schedule(self):
+        return self._schedule
+
+    @property
+    def standings(self):
+        return self._standings
+
+    @property
+    def table(self):
+        return self._standings.to_frame()
+
+    @property
+    def results(self):
+        return self._results
+
+    @property
+    def is_over(self):
+        return self._round_counter >= len(self._schedule)
+
+    def _merge(self, fixture: Fixture, summary: dict):
+        self._standings.record_summary(fixture[0], fixture[1], summary)
+        self._world.roll_up_match_summary(summary["players"])
+        self._results.append(summary)
+
+    def play_round(self, executor: ProcessPoolExecutor) -> List[dict]:
+        """
+        plays the next round, every match in its own worker.
+        the results are merged in the order of the schedule, so a seeded season always ends the same way.
+
+        :return: the match summaries of the round
+        """
+        fixtures = self._schedule[self._round_counter]
+        snapshots = [snapshot_team(team) for team in self._teams]
+        futures = []
+        for left, right in fixtures:
+            futures.append(executor.submit(simulate_match, snapshots[left], snapshots[right],
+                                           self._seed_sequences[self._match_counter]))
+            self._match_counter += 1
+        summaries = [future.result() for future in futures]
+        for fixture, summary in zip(fixtures, summaries):
+            self._merge(fixture, summary)
+        self._round_counter += 1
+        return summaries
+
+    def play(self, show_table: bool = False) -> List[dict]:
+        """plays all the remaining rounds. :return: the match summaries of the whole season"""
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+            while not self.is_over:
+                self.play_round(executor)
+                if show_table:
+                    self._standings.show()
+        return self._results
@@ -0,0 +1,348 @@
+"""
+Match server: plays manager and star player games for many clients from a single asyncio loop.
+
+every connection plays one game at a time over a line protocol, one JSON object per line.
+
+client to server:
+    {"type": "start", "game": "manager" or "star", "left": 0, "right": 1, "seed": 7}  (left, right and seed optional)
+    {"type": "answer", "value": 2}
+    {"type": "quit"}
+server to client:
+    {"type": "decision", "kind": "SHOOT_TARGET", "prompt": "...", "options": [0, 1, 2, 3, 4], "error": "",
+     "score": [3, 2]}
+    {"type": "summary", "summary": {...}}
+    {"type": "error", "message": "..."}
+
+the games run headless, so they never read the keyboard or sleep. between decisions a match runs one set at a time
+and gives the loop a turn after every set, so a long stretch of AI play never holds up the other sessions.
+
+the teams are built from the roster of --roster, or of DISCBALL_PLAYERS_PATH (see constants) by default. the roster
+is read before the server starts listening.
+
+usage:
+    python server_logic.py [--host 127.0.0.1] [--port 8765] [--roster players.xlsx]
+    python server_logic.py --unix /tmp/discball.sock
+    python server_logic.py --load-test 200
+"""
+import asyncio
+import json
+from argparse import ArgumentParser
+from random import Random
+from time import perf_counter
+from typing import Callable, List, Union
+
+from coach_logic import ManagerGame
+from constants import Color, COLORS, NUM_OF_PLAYERS_IN_TEAM, TEAMS
+from decision_class import DecisionRequest, MatchSteps
+from player_class import Player
+from rng_logic import MatchRandom
+from star_player_logic import MainPlayerGame
+from team_class import Team
+from world_class import World
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+GAME_TYPES = {"manager": ManagerGame, "star": MainPlayerGame}
+MAX_LINE = 64 * 1024  # longest line a client may send
+
+
+def _encode(message: dict) -> bytes:
+    return (json.dumps(message, default=str) + "\n").encode()
+
+
+def load_roster(path: str = None) -> List[dict]:
+    """:return: the records of the players file at path, of the default one when None"""
+    from roster_class import RosterRepository  # pandas is only needed to read the file
+    repository = RosterRepository(path) if path is not None else RosterRepository.default()
+    try:
+        return repository.records
+    except Exception as error:
+        print(f"can not read the roster {repository.path} ({error!r}). "
+              f"pass one with --roster or set DISCBALL_PLAYERS_PATH")
+        raise
+
+
+class MatchSession:
+    """A game of one client, in a world of its own so that sessions never share players or locks."""
+
+    def __init__(self, game_type: str, records: List[dict], left: int = 0, right: int = 1, seed: int = None):
+        """
+        :param records: roster records, NUM_OF_PLAYERS_IN_TEAM per team in the order of TEAMS
+        :param left: index of the left team, right: index of the right team
+        """
+        if game_type not in GAME_TYPES:
+            print(f"there is no game type {game_type}, use one of {list(GAME_TYPES)}")
+            raise ValueError(game_type)
+        num_of_teams = len(records) // NUM_OF_PLAYERS_IN_TEAM
+        if left == right or not (0 <= left < num_of_teams and 0 <= right < num_of_teams):
+            print(f"the teams must be two different indexes below {num_of_teams}, got {left} and {right}")
+            raise ValueError((left, right))
+        self._world = World()
+        teams = [self._build_team(records, index) for index in (left, right)]
+        self._match = MatchSteps(GAME_TYPES[game_type](*teams, headless=True, rng=MatchRandom(seed)))
+
+    def _build_team(self, records: List[dict], index: int) -> Team:
+        first = index * NUM_OF_PLAYERS_IN_TEAM
+        player_ids = [Player(record, self._world).get_id for record in records[first:first + NUM_OF_PLAYERS_IN_TEAM]]
+        return Team(TEAMS[index % len(TEAMS)], Color[COLORS[index % len(COLORS)].upper()], player_ids, self._world)
+
+    # Properties
+    @property
+    def match(self) -> MatchSteps:
+        return self._match
+
+    @property
+    def is_over(self):
+        return self._match.is_over
+
+    @property
+    def score(self) -> list:
+        game = self._match.game
+        return [game.left_score, game.right_score]
+
+    async def play(self, answer=None) -> Union[DecisionRequest, None]:
+        """
+        starts the match, or answers its pending decision, and runs it until the next one, one set at a time.
+
+        :return: the next decision, None when the match ended
+        """
+        request = self._match.resume(answer)
+        while request is None and not self._match.is_over:
+            await asyncio.sleep(0)  # let the other sessions run between sets
+            request = self._match.resume()
+        return request
+
+    def close(self):
+        self._world.close()
+
+
+class MatchServer:
+    """
+    Serves match sessions to clients of a TCP or Unix socket, see the module docstring for the protocol.
+
+    a session's state lives in its MatchSteps, so a session that waits for its client costs no thread and no time.
+    """
+
+    def __init__(self, records: List[dict] = None):
+        """:param records: the roster the sessions' teams are built from, the default roster when None"""
+        self._records = records
+        self._sessions = set()
+        self._decisions = 0
+
+    # Properties
+    @property
+    def records(self) -> List[dict]:
+        if self._records is None:
+            self._records = load_roster()  # read the default roster when the first game starts
+        return self._records
+
+    @property
+    def num_of_sessions(self):
+        return len(self._sessions)
+
+    @property
+    def decisions(self):
+        """the decisions sent to clients so far"""
+        return self._decisions
+
+    async def serve_tcp(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle, host, port, limit=MAX_LINE)
+
+    async def serve_unix(self, path: str) -> asyncio.AbstractServer:
+        return await asyncio.start_unix_server(self.handle, path, limit=MAX_LINE)
+
+    def _start(self, message: dict) -> MatchSession:
+        return MatchSession(message.get("game"), self.records, message.get("left", 0), message.get("right", 1),
+                            message.get("seed"))
+
+    def _progress(self, session: MatchSession, request: Union[DecisionRequest, None]) -> dict:
+        if request is None:
+            return {"type": "summary", "summary": session.match.summary}
+        self._decisions += 1
+        return {"type": "decision", "kind": request.kind.name, "prompt": request.prompt,
+                "options": request.options, "error": request.error, "score": session.score}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """plays the games of one connection until the client quits or hangs up."""
+        session = None
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):
+                    break  # a line over MAX_LINE, or the connection broke
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    message_type = message["type"]
+                except (ValueError, TypeError, KeyError):
+                    writer.write(_encode({"type": "error", "message": "every line must be a JSON object with a type"}))
+                    await writer.drain()
+                    continue
+
+                if message_type == "quit":
+                    break
+                if message_type == "start":
+                    if session is not None:
+                        self._end(session)
+                        session = None
+                    try:
+                        session = self._start(message)
+                        self._sessions.add(session)
+                        reply = self._progress(session, await session.play())
+                    except Exception as error:
+                        reply = self._fail(session, f"can not start the game: {error!r}")
+                        session = None
+                elif message_type == "answer":
+                    if session is None or session.is_over:
+                        reply = {"type": "error", "message": "there is no game waiting for an answer, start one"}
+                    else:
+                        try:
+                            reply = self._progress(session, await session.play(message.get("value")))
+                        except Exception as error:
+                            reply = self._fail(session, f"the game stopped: {error!r}")
+                            session = None
+                else:
+                    reply = {"type": "error", "message": f"unknown message type {message_type!r}"}
+                if session is not None and session.is_over:
+                    self._end(session)
+                writer.write(_encode(reply))
+                await writer.drain()
+        except ConnectionError:
+            pass  # the client hung up while a reply was sent
+        finally:
+            if session is not None:
+                self._end(session)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, asyncio.CancelledError):
+                pass  # the client hung up first, or the server is shutting down
+
+    def _fail(self, session: Union[MatchSession, None], message: str) -> dict:
+        """ends a session that raised, the connection stays open for a new game. :return: the error reply"""
+        print(message)
+        if session is not None:
+            self._end(session)
+        return {"type": "error", "message": message}
+
+    def _end(self, session: MatchSession):
+        if session in self._sessions:
+            self._sessions.remove(session)
+            session.close()
+
+
+async def scripted_client(start: dict, choose: Callable[[dict], object], host: str = DEFAULT_HOST,
+                          port: int = DEFAULT_PORT, path: str = None, latencies: list = None) -> dict:
+    """
+    plays one game against a server, answering every decision with choose.
+
+    :param start: the start message, e.g. {"type": "start", "game": "manager", "seed": 1}
+    :param choose: gets a decision message and returns the answer, or a coroutine of the answer
+    :param path: the server's Unix socket, host and port are used when None
+    :param latencies: a list that gets the seconds every reply of the server took
+    :return: the match summary
+    """
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path, limit=MAX_LINE)
+    else:
+        reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+    try:
+        message = start
+        while True:
+            sent = perf_counter()
+            writer.write(_encode(message))
+            await writer.drain()
+            line = await reader.readline()
+            if latencies is not None:
+                latencies.append(perf_counter() - sent)
+            if not line:
+                print("the server closed the connection in the middle of the game")
+                raise ConnectionError("connection closed")
+            reply = json.loads(line)
+            if reply["type"] == "summary":
+                return reply["summary"]
+            if reply["type"] != "decision":
+                print(f"the server refused the game: {reply.get('message')}")
+                raise RuntimeError(reply.get("message"))
+            answer = choose(reply)
+            if asyncio.iscoroutine(answer):
+                answer = await answer
+            message = {"type": "answer", "value": answer}
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def load_test(num_of_clients: int, records: List[dict] = None, seed: int = 0, think: float = 0) -> dict:
+    """
+    serves num_of_clients scripted clients at once from a server on a free local port, half of them manager games
+    and half star player games, every client answering at random.
+
+    :param think: mean seconds a client thinks before it answers, 0 for clients that answer at once (the worst case)
+
+    :return: dict of the number of games and replies, the wall time, and the reply latency percentiles in ms
+    """
+    server = MatchServer(records)
+    listener = await server.serve_tcp(DEFAULT_HOST, 0)
+    port = listener.sockets[0].getsockname()[1]
+    latencies = []
+
+    async def client(i):
+        chooser = Random(seed + i)
+
+        async def choose(decision):
+            if think:
+                await asyncio.sleep(chooser.uniform(0, 2 * think))
+            return chooser.choice(decision["options"])
+
+        start = {"type": "start", "game": "manager" if i % 2 else "star", "seed": seed + i}
+        return await scripted_client(start, choose, port=port, latencies=latencies)
+
+    started = perf_counter()
+    async with listener:
+        summaries = await asyncio.gather(*(client(i) for i in range(num_of_clients)))
+    seconds = perf_counter() - started
+    latencies.sort()
+
+    def percentile(q):
+        return round(1000 * latencies[min(int(q * len(latencies)), len(latencies) - 1)], 2)
+
+    return {"games": len(summaries), "replies": len(latencies), "seconds": round(seconds, 2),
+            "p50_ms": percentile(0.5), "p99_ms": percentile(0.99), "max_ms": percentile(1)}
+
+
+async def _serve(server: MatchServer, host: str, port: int, path: str):
+    listener = await (server.serve_unix(path) if path else server.serve_tcp(host, port))
+    print(f"serving games on {path or f'{host}:{port}'}")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    parser = ArgumentParser(description="serves manager and star player games over a line protocol")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", default=None, help="serve on this Unix socket instead of TCP")
+    parser.add_argument("--roster", default=None,
+                        help="players file the teams are built from, DISCBALL_PLAYERS_PATH by default")
+    parser.add_argument("--load-test", type=int, default=None, metavar="CLIENTS",
+                        help="play this many scripted clients at once against a local server and report latencies")
+    parser.add_argument("--think", type=float, default=0, help="mean seconds a load test client thinks")
+    args = parser.parse_args()
+    try:
+        records = load_roster(args.roster)
+    except Exception:
+        raise SystemExit(1)  # load_roster said why
+    if args.load_test:
+        print(asyncio.run(load_test(args.load_test, records, think=args.think)))
+        return
+    try:
+        asyncio.run(_serve(MatchServer(records), args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+from bisect import bisect
+from itertools import accumulate
+from math import floor
+from types import GeneratorType
+from typing import Callable, Generator, List, Tuple, Union
+
+from field_class import DISTANCES
+from decision_class import DecisionRequest
+from player_class import Player
+from rng_logic import MatchRandom
+
+ShootingResult = Tuple[Player, Player, bool]  # shooter, target, whether the target fell
+ChoiceSteps = Generator[DecisionRequest, object, Player]  # decisions that end with a target
+
+
+def _target_state(target: Player) -> tuple:
+    priority = (5 if target.has_disc else 1) * (2 if target.column in [10, 11] else 1)
+    return target.row, target.column, priority, target.agility, target.stability
+
+
+def _fill_column(outcomes: list, j: int, shooter_state: list, shot_rolls: list, target_state: tuple,
+                 evasion_uniforms: list, balance_uniforms: list):
+    """
+    computes the pairs of every shooter with a single target, in place.
+
+    :param outcomes: target-choice weights, shot qualities, evasion attempts and retreat blocks, one row per shooter
+    :param shooter_state: list of (row, column, shooting) per shooter
+    :param target_state: (row, column, priority, agility, stability) of the target
+    """
+    weight_rows, quality_rows, evasion_rows, block_rows = outcomes
+    row, column, priority, agility, stability = target_state
+    for i, (shooter_row, shooter_column, _) in enumerate(shooter_state):
+        distance = DISTANCES[shooter_row - row][shooter_column - column]
+        if distance == 0:
+            print(f"a shooter and a target share a block ({row}, {column})")
+            raise ZeroDivisionError(f"shared block ({row}, {column})")
+        shot_quality = shot_rolls[i] // distance
+        balance_attempt = (floor(balance_uniforms[i] * stability) + 1) // 3
+        weight_rows[i][j] = priority / distance
+        quality_rows[i][j] = shot_quality
+        evasion_rows[i][j] = floor(evasion_uniforms[i] * agility) + 1
+        block_rows[i][j] = 2 if balance_attempt > shot_quality else 5 if balance_attempt == shot_quality else 10
+
+
+def resolve_shooting(shooters: List[Player], targets: List[Player], target_is_left: bool, rng: MatchRandom,
+                     choose_target: Union[Callable[[Player], Union[Player, None]], None] = None
+                     ) -> List[ShootingResult]:
+    """
+    resolves the shots of a whole turn.
+
+    all the random draws of the turn are made at once, and the weights, shot qualities, evasion attempts and retreats
+    of every shooter-target pair are computed up front. the shots are then applied in order, and only the column of a
+    target that was moved by a shot is recomputed, so every shooter sees the same field it would have seen shooting
+    one at a time.
+
+    :param choose_target: optional callback that picks a shooter's target itself (a star player), None to let the
+    weights decide
+    :return: list of (shooter, target, there_was_a_fall) in shooting order
+    """
+    steps = shooting_steps(shooters, targets, target_is_left, rng, choose_target)
+    try:
+        request = next(steps)
+    except StopIteration as stop:
+        return stop.value
+    print(f"resolve_shooting can not wait for a decision ({request.kind.name}), use shooting_steps")
+    raise RuntimeError("decision needed")
+
+
+def shooting_steps(shooters: List[Player], targets: List[Player], target_is_left: bool, rng: MatchRandom,
+                   choose_target: Union[Callable[[Player], Union[Player, None, ChoiceSteps]], None] = None
+                   ) -> Generator[DecisionRequest, object, List[ShootingResult]]:
+    """
+    resolve_shooting, as a generator that can stop for a human's decision in the middle of the shots.
+
+    :param choose_target: like in resolve_shooting, but it may also return a generator of decisions (see
+    decision_class.ask) whose return value is the target
+    :return: list of (shooter, target, there_was_a_fall) in shooting order
+    """
+    num_of_shooters = len(shooters)
+    num_of_targets = len(targets)
+    uniforms = rng.random_array((2 * num_of_targets + 2, num_of_shooters)).tolist()
+    choice_uniforms = uniforms[0]
+    shooter_state = [(shooter.row, shooter.column, shooter.shooting) for shooter in shooters]
+    shot_rolls = [floor(uniform * shooting) + 1 for uniform, (_, _, shooting) in zip(uniforms[1], shooter_state)]
+    evasion_uniforms = uniforms[2:num_of_targets + 2]  # one row per target, one column per shooter
+    balance_uniforms = uniforms[num_of_targets + 2:]
+    target_state = [_target_state(target) for target in targets]
+    outcomes = [[[0] * num_of_targets for _ in shooters] for _ in range(4)]
+    for j in range(num_of_targets):
+        _fill_column(outcomes, j, shooter_state, shot_rolls, target_state[j], evasion_uniforms[j], balance_uniforms[j])
+
+    weight_rows, quality_rows, evasion_rows, block_rows = outcomes
+    results = []
+    for i, shooter in enumerate(shooters):
+        target = choose_target(shooter) if choose_target else None
+        if isinstance(target, GeneratorType):
+            target = yield from target
+        if target is None:
+            cumulative_weights = list(accumulate(weight_rows[i]))
+            j = min(bisect(cumulative_weights, choice_uniforms[i] * cumulative_weights[-1]), len(targets) - 1)
+            target = targets[j]
+        else:
+            j = targets.index(target)
+
+        there_was_a_fall = Player.face_off(shooter, target, target_is_left,
+                                           shot_quality=quality_rows[i][j],
+                                           evasion_attempt=evasion_rows[i][j],
+                                           retreat_blocks=block_rows[i][j])
+        results.append((shooter, target, there_was_a_fall))
+
+        if target_state[j][1] != target.column or (target_state[j][2] >= 5) != target.has_disc:
+            # the shot moved the target (or knocked the disc loose), refresh its column only
+            target_state[j] = _target_state(target)
+            _fill_column(outcomes, j, shooter_state, shot_rolls, target_state[j],
+                         evasion_uniforms[j], balance_uniforms[j])
+    return results
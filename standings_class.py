@@ -0,0 +1,154 @@
+from heapq import heapify, heappop, heappush
+from typing import Dict, List
+
+from constants import COLOR_RESET
+from pandas import DataFrame
+
+
+class TeamStanding:
+    """A team's line in the league table."""
+
+    def __init__(self, team_id: int, name: str, color: str):
+        self._team_id = team_id
+        self._name = name
+        self._color = color  # ANSI escape code, as in the league table
+        self.touchdowns = 0
+        self.conceded = 0
+        self.ratio = 0
+        self.points = 0
+
+    @property
+    def team_id(self):
+        return self._team_id
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def color(self):
+        return self._color
+
+    @property
+    def sort_key(self):
+        """teams are ordered by points, then ratio (both descending), then by id like a stable sort would."""
+        return -self.points, -self.ratio, self._team_id
+
+    def update_ratio(self):
+        if self.conceded:
+            self.ratio = self.touchdowns * 100 // self.conceded
+        else:
+            self.ratio = float("inf") if self.touchdowns else 0
+
+
+class Standings:
+    """
+    League table keyed by team id, kept in order as results come in.
+
+    the order is a heap of sort keys. recording a result pushes the new keys of its two teams and leaves their old
+    keys behind as stale entries, so a result costs O(log n) however many teams the league has. reading the top k
+    teams pops them off the heap and pushes them back. the stale entries are dropped when they outnumber the teams.
+    """
+
+    def __init__(self):
+        self._standings: Dict[int, TeamStanding] = {}
+        self._versions: Dict[int, int] = {}  # the version of every team's current heap entry
+        self._heap: List[tuple] = []  # sort key + version of every team, and stale entries of older versions
+
+    @classmethod
+    def from_league_table(cls, table: DataFrame):
+        """builds standings from a league table DataFrame (see data.import_league)."""
+        standings = cls()
+        for row in table.to_dict("records"):
+            standings.add_team(int(row["ID"]), row["Name"], row["Color"])
+            standing = standings[int(row["ID"])]
+            standings._update(standing, row.get("touchdowns", 0), row.get("conceded", 0), row.get("points", 0))
+        return standings
+
+    def __len__(self):
+        return len(self._standings)
+
+    def __getitem__(self, team_id: int) -> TeamStanding:
+        return self._standings[team_id]
+
+    def add_team(self, team_id: int, name: str, color: str):
+        if team_id in self._standings:
+            print(f"team {team_id} is already in the standings")
+            raise ValueError(team_id)
+        standing = TeamStanding(team_id, name, color)
+        self._standings[team_id] = standing
+        self._versions[team_id] = 0
+        heappush(self._heap, standing.sort_key + (0,))
+
+    def _is_current(self, entry: tuple) -> bool:
+        return self._versions[entry[2]] == entry[3]
+
+    def _compact(self):
+        self._heap = [entry for entry in self._heap if self._is_current(entry)]
+        heapify(self._heap)
+
+    def _update(self, standing: TeamStanding, touchdowns: int, conceded: int, points: int):
+        old_key = standing.sort_key
+        standing.touchdowns += touchdowns
+        standing.conceded += conceded
+        standing.points += points
+        standing.update_ratio()
+        new_key = standing.sort_key
+        if new_key != old_key:
+            version = self._versions[standing.team_id] + 1
+            self._versions[standing.team_id] = version
+            heappush(self._heap, new_key + (version,))
+            if len(self._heap) > 2 * len(self._standings) + 16:
+                self._compact()
+
+    def record_match(self, left_team_id: int, right_team_id: int, left_score: int, right_score: int):
+        """adds a result the same way data.update_league_table does: the winner also gains its margin in points."""
+        left_points, right_points = left_score, right_score
+        if left_score > right_score:
+            left_points += left_score - right_score
+        else:
+            right_points += right_score - left_score
+        self._update(self._standings[left_team_id], left_score, right_score, left_points)
+        self._update(self._standings[right_team_id], right_score, left_score, right_points)
+
+    def record_summary(self, left_team_id: int, right_team_id: int, match_summary: dict):
+        self.record_match(left_team_id, right_team_id, match_summary["left score"], match_summary["right score"])
+
+    def top(self, k: int) -> List[TeamStanding]:
+        """:return: the first k teams of the table, in O(k log n)"""
+        entries = []
+        while self._heap and len(entries) < k:
+            entry = heappop(self._heap)
+            if self._is_current(entry):
+                entries.append(entry)
+        for entry in entries:
+            heappush(self._heap, entry)
+        return [self._standings[entry[2]] for entry in entries]
+
+    def ordered(self) -> List[TeamStanding]:
+        self._compact()
+        return [self._standings[entry[2]] for entry in sorted(self._heap)]
+
+    def to_frame(self) -> DataFrame:
+        return DataFrame([{"ID": standing.team_id, "Color": standing.color, "Name": standing.name,
+                           "touchdowns": standing.touchdowns, "conceded": standing.conceded,
+                           "ratio": standing.ratio, "points": standing.points} for standing in self.ordered()])
+
+    def render(self, k: int = None) -> str:
+        """
+        :param k: number of teams to show, all of them if None
+        :return: the table as colored text, one team per line under a header
+        """
+        shown = self.ordered() if k is None else self.top(k)
+        name_width = max([len("Name")] + [len(standing.name) for standing in shown])
+        rank_width = len(str(len(shown)))
+        lines = [" " * (rank_width + 2) + f"{'Name':<{name_width}}  touchdowns  conceded  ratio  points"]
+        for rank, standing in enumerate(shown, start=1):
+            lines.append(f"{rank:<{rank_width}}  {standing.color}{standing.name:<{name_width}}  "
+                         f"{standing.touchdowns:>10}  {standing.conceded:>8}  {standing.ratio:>5}  "
+                         f"{standing.points:>6}{COLOR_RESET}")
+        return "\n".join(lines)
+
+    def show(self, k: int = None):
+        print(self.render(k))
+        print("\n")
@@ -1,57 +1,63 @@
 from player_class import Player
 from team_class import Team
 from game_class import Game
-from constants import Color, NUM_OF_PLAYERS_IN_TEAM, POINTS_FOR_WIN
+from rng_logic import MatchRandom
+from timing_class import StageTimer
+from events_class import TurnResult
+from decision_class import DecisionKind, ask
+from constants import NUM_OF_PLAYERS_IN_LINE_UP
 from time import sleep
-
-
-def validate_answer(text: str, options: list):
-    while True:
-        your_input = None
-        try:
-            your_input = int(input(text))
-        except ValueError:
-            pass
-        finally:
-            if your_input in options:
-                return your_input
-            print(f"that not an option.\n"
-                  f"the options are {options}. try again")
+from typing import Union
 
 
 class MainPlayerGame(Game):
-    def __init__(self, left_team: Team, right_team: Team):
-        super().__init__(left_team, right_team)
-        self.main_team = None
-        self.main_player: Player = self.decide_player()
-
-    def decide_player(self):
+    def __init__(self, left_team: Team, right_team: Team, headless: bool = False, rng: MatchRandom = None,
+                 timer: StageTimer = None, event_sink=None, main_player: Player = None):
+        """
+        :param main_player: the player a human controls, asked for when the match starts when None
+        """
+        super().__init__(left_team, right_team, headless, rng, timer, event_sink)
+        self.main_team: Union[Team, None] = None
+        self.main_player: Union[Player, None] = main_player
+        if main_player is not None:
+            self.main_team = left_team if main_player in left_team.roster else right_team
+
+    def _decide_player_steps(self):
         team_ids = [team.team_id for team in self.teams]
-        chosen_team_id = validate_answer(f"choose team. use id's from the following list: {team_ids}", team_ids)
+        chosen_team_id = yield from ask(DecisionKind.TEAM,
+                                        f"choose team. use id's from the following list: {team_ids}", team_ids)
         for team in self.teams:
             if team.team_id == chosen_team_id:
                 self.main_team = team
                 player_ids = [player.get_id for player in team.roster]
-                chosen_player_id = validate_answer(f"choose player. "
-                                                   f"use id's from the following list: {player_ids}", player_ids)
+                chosen_player_id = yield from ask(DecisionKind.PLAYER, f"choose player. "
+                                                  f"use id's from the following list: {player_ids}", player_ids)
                 for player in team.roster:
                     if player.get_id == chosen_player_id:
-                        print(
-                            f"you chose {player.format_name}. you will play for {self.main_team.format_team_name()}")
+                        if not self._headless:
+                            print(f"you chose {player.format_name}. "
+                                  f"you will play for {self.main_team.format_team_name()}")
                         return player
         raise Exception()
 
     def _prepare_match(self):
-        self._left_team.is_left = True
-        self._right_team.is_left = False
-        self._set_counter = 0
+        self._reset_match_state()
         for team in self.teams:
             team.reset_all_positions()
             team.inhibit_substitution()
         self._declare_teams()
-        self.main_player.is_star_player = True
+        self.main_player.is_star_player = not self._headless
+
+    def _prepare_steps(self):
+        if self.main_player is None:
+            self.main_player = yield from self._decide_player_steps()
+        self._prepare_match()
+
+    def _set_steps(self):
+        self._prepare_set()
+        yield from self._phase_steps()
 
-    def _turn(self) -> str:
+    def _turn_steps(self):
         self._turn_counter = 0
         sleep_timer = 3
 
@@ -60,69 +66,71 @@ class MainPlayerGame(Game):
         while True:
             # a loop that runs until a touchdown is scored, the carrier drops the disc or there were more than 10 turns
             self._turn_counter += 1
+            self._total_turns += 1
 
             for team in self.teams:
-                team.advance_all()
+                team.advance_all(self._rng)
 
             self._declare_state()
 
             taker = None
-            there_was_a_drop = False
-            for player in self._shooting_team.line_up:
-                if player is self.main_player:
-                    target_num = validate_answer("choose which player to shoot", [position for position in range(5)])
-                    target_player = self._running_team.line_up[target_num]
-                else:
-                    target_player = Game._choose_target(player, self._running_team.line_up)
-                there_was_a_fall = Player.face_off(player, target_player, self._running_team.is_left)
+            for player, target_player, there_was_a_fall in \
+                    (yield from self._face_off_steps(self.choose_shooting_target)):
                 if there_was_a_fall and target_player is self.carrier:
-                    there_was_a_drop = True
-                    taker = player.format_name
+                    taker = player
 
-            sleep(sleep_timer)
-
-            if there_was_a_drop:
-                self._declare_state()
-                print(f"{taker} has manage to take {self._carrier.format_name} down!")
+            if not self._headless:
                 sleep(sleep_timer)
+
+            if taker is not None:
+                self._end_turn(TurnResult.DROP, sleep_timer, taker)
                 return "Drop"
 
             if self._check_touchdown():
-                self._declare_state()
-                print(f"{self._carrier.format_name} scored a touchdown!")
-                sleep(sleep_timer)
+                self._end_turn(TurnResult.TOUCHDOWN, sleep_timer)
                 return "Touchdown"
 
             if self._turn_counter > 9:
-                self._declare_state()
-                print(f"Time! the disc is now free!")
-                sleep(sleep_timer)
+                self._end_turn(TurnResult.TIME, sleep_timer)
                 return "Time"
 
-    def _phase(self):
+    def _phase_steps(self):
         self._phase_counter = 0
         while True:
             self._phase_counter += 1
+            self._total_phases += 1
+            self._turn_counter = 0
             self._creating_competition()
             self._declare_state()
             if self.carrier is self.main_player:
-                play_turn = self.choose_dash_or_pass()
+                play_turn = yield from self._dash_or_pass_steps()
             else:
                 play_turn = self.dash_or_successful_pass()
             if not play_turn:
                 continue
 
-            result = self._turn()
+            result = yield from self._turn_steps()
             if result == "Touchdown":
                 break
 
-    def choose_dash_or_pass(self):
-        print(f"you have created the disc! \n"
-              f"would you rather dashing with it or passing it to another player?")
-        if validate_answer("for dash, press 0. for pass, press 1", [0, 1]) == 0:
+    def choose_shooting_target(self, shooter: Player):
+        """:return: None to let the odds pick the shooter's target, the decisions of the main player otherwise"""
+        if shooter is not self.main_player:
+            return None
+        return self._shooting_target_steps()
+
+    def _shooting_target_steps(self):
+        target_num = yield from ask(DecisionKind.SHOOT_TARGET, "choose which player to shoot",
+                                    list(range(NUM_OF_PLAYERS_IN_LINE_UP)))
+        return self._running_team.line_up[target_num]
+
+    def _dash_or_pass_steps(self):
+        if (yield from ask(DecisionKind.DASH_OR_PASS, "you have created the disc! \n"
+                           "would you rather dashing with it or passing it to another player?\n"
+                           "for dash, press 0. for pass, press 1", [0, 1])) == 0:
             self.main_player.dash()
             return True
         else:
             options = [player.position for player in self._running_team.line_up if player is not self.main_player]
-            target_num = validate_answer("choose a player to pass to", options)
+            target_num = yield from ask(DecisionKind.PASS_TARGET, "choose a player to pass to", options)
             return self.pass_try(self._running_team.line_up[target_num])
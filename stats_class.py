@@ -0,0 +1,183 @@
+from typing import Dict, Iterable, List
+from numpy import zeros, int64, flatnonzero
+
+STAT_NAMES = [
+    "sets_played",
+    # offensive
+    # points gain
+    "touchdowns",
+    "assists",
+
+    # advancements
+    "distance_carried",
+    "distance_passed",
+    "advancement_by_catch",
+
+    # creating
+    "creations",
+    "end_zone_creation",
+
+    # holding
+    "carrier_evasions",
+    "drop_avoidance",
+
+    # defensive
+    "last_ditch_hits",
+    "last_ditch_takedowns",
+    "carrier_takedowns",
+    "carrier_hits",
+
+    # formation
+    # positioning
+    "distance_covered",
+    "turns_in_touchdown_strip",
+    "evasions",
+    "fall_avoidance",
+
+    # pressure
+    "successful_shots",
+    "successful_takedowns",
+
+    # fails
+    # offensive fail
+    "drops_made",
+    "failed_passes",
+    "failed_catches",
+
+    # positioning fails
+    "hits_taken",
+    "balance_losses",
+
+    # pass numbers
+    "passes_made",
+    "catches_made",
+    "dashes"
+]
+STAT_INDEX = {stat: slot for slot, stat in enumerate(STAT_NAMES)}
+
+
+class StatsStore:
+    """Stat counters of many players, held in one array indexed by player id and stat slot."""
+
+    def __init__(self, capacity: int = 64):
+        self._values = zeros((max(capacity, 1), len(STAT_NAMES)), dtype=int64)
+        self._listeners = []  # told about every change, see subscribe
+
+    def subscribe(self, listener):
+        """
+        :param listener: an object with rows_changed(player_ids), called after rows change, and reset(), called after
+        every row was cleared (e.g. a Leaderboard)
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self._listeners.remove(listener)
+
+    def _rows_changed(self, player_ids):
+        for listener in self._listeners:
+            listener.rows_changed(player_ids)
+
+    @property
+    def values(self):
+        return self._values
+
+    @property
+    def capacity(self):
+        return self._values.shape[0]
+
+    def ensure_capacity(self, player_id: int):
+        """grows the array (doubling it) until player_id has a row of its own."""
+        capacity = self.capacity
+        if player_id < capacity:
+            return
+        while capacity <= player_id:
+            capacity *= 2
+        grown = zeros((capacity, len(STAT_NAMES)), dtype=int64)
+        grown[:self.capacity] = self._values
+        self._values = grown
+
+    def increment(self, player_id: int, stat: str, amount: int):
+        self._values[player_id, STAT_INDEX[stat]] += amount
+        if self._listeners:
+            self._rows_changed([player_id])
+
+    def get(self, player_id: int, stat: str) -> int:
+        return self._values.item(player_id, STAT_INDEX[stat])
+
+    def add_row(self, player_id: int, values: list):
+        """adds a whole row of counters (in STAT_NAMES order) to a player's counters."""
+        self._values[player_id] += values
+        if self._listeners:
+            self._rows_changed([player_id])
+
+    def add_rows(self, player_ids: Iterable[int], values):
+        """
+        adds a matrix of counters to the counters of many players at once.
+
+        :param player_ids: distinct player ids, one per row of values
+        :param values: array of shape (len(player_ids), len(STAT_NAMES)), in STAT_NAMES order
+        """
+        player_ids = list(player_ids)
+        self._values[player_ids] += values
+        if self._listeners:
+            self._rows_changed(player_ids)
+
+    def roll_into(self, targets: Iterable["StatsStore"], player_ids: Iterable[int] = None):
+        """
+        adds the counters of the given players (of every player when None) to each of the target stores, then
+        zeroes them in place.
+        """
+        if player_ids is None:
+            changed = flatnonzero(self._values.any(axis=1))
+            for target in targets:
+                target.values[:self.capacity] += self._values
+                if target._listeners:
+                    target._rows_changed(changed)
+            self._values.fill(0)
+            if self._listeners:
+                self._rows_changed(changed)
+            return
+        player_ids = list(player_ids)
+        rows = self._values[player_ids]
+        for target in targets:
+            target.add_rows(player_ids, rows)
+        self._values[player_ids] = 0
+        if self._listeners:
+            self._rows_changed(player_ids)
+
+    def row(self, player_id: int):
+        return self._values[player_id]
+
+    def leaders(self, player_ids: Iterable[int], skip: Iterable[str] = ("sets_played",)) -> Dict[int, List[str]]:
+        """
+        finds the leaders of every stat among the given players in one pass over their rows. ties are all leaders,
+        and no one leads a stat that no one has more than 0 of.
+
+        :param skip: stats that have no leaders
+        :return: dict of player id to the stats that player leads, for players that lead at least one
+        """
+        player_ids = list(player_ids)
+        rows = self._values[player_ids]
+        maximums = rows.max(axis=0)
+        is_leader = (rows == maximums) & (maximums > 0)
+        for stat in skip:
+            is_leader[:, STAT_INDEX[stat]] = False
+        return {player_ids[i]: [STAT_NAMES[slot] for slot in flatnonzero(is_leader[i])]
+                for i in flatnonzero(is_leader.any(axis=1))}
+
+    def clear(self, player_ids: Iterable[int]):
+        player_ids = list(player_ids)
+        self._values[player_ids] = 0
+        if self._listeners:
+            self._rows_changed(player_ids)
+
+    def clear_all(self):
+        self._values[:] = 0
+        for listener in self._listeners:
+            listener.reset()
+
+    def to_frame(self, player_ids: Iterable[int]) -> "DataFrame":
+        """builds a DataFrame of the given players' counters, indexed by player id."""
+        from pandas import DataFrame  # only the tables need pandas, the counters do not
+        player_ids = list(player_ids)
+        return DataFrame(self._values[player_ids], columns=STAT_NAMES, index=player_ids)
@@ -2,38 +2,43 @@ import random
 
 from constants import Color, NUM_OF_PLAYERS_IN_LINE_UP, NUM_OF_PLAYERS_IN_TEAM, paint
 from player_class import Player
-from typing import List
+from world_class import World, resolve_world
+from typing import List, Tuple
 
 # TODO: shooting order
 
 
 class Team:
-    _id_counter = 0  # Static counter for unique IDs
-    _all_instances = []  # Static list to keep track of all instances
 
-    def __init__(self, name: str, color: Color, list_of_player_indexes: list):
-
-        self._team_id = Team._id_counter
-        Team._id_counter += 1
-        Team._all_instances.append(self)
+    def __init__(self, name: str, color: Color, list_of_player_indexes: list, world: World = None):
+        """
+        :param list_of_player_indexes: ids of the team's players in world
+        :param world: the World the team and its players belong to, the default one when None
+        """
+        self._world: World = resolve_world(world)
+        self._team_id = self._world.add_team(self)
 
         self._name: str = name
         self._color: Color = color
-        self._roster: List[Player] = [Player.get_all_instances()[i] for i in list_of_player_indexes]
+        self._roster: List[Player] = [self._world.get_player(i) for i in list_of_player_indexes]
         self._default_starting_roster_ids = list_of_player_indexes
         self._is_left = False
         self._can_substitute = False
 
     @classmethod
     def get_all_instances(cls):
-        """Class method to retrieve all instances."""
-        return cls._all_instances
+        """Class method to retrieve all instances of the default world."""
+        return World.default().teams
 
     # Property for team_id
     @property
     def team_id(self):
         return self._team_id
 
+    @property
+    def world(self) -> World:
+        return self._world
+
     # Property for name
     @property
     def name(self):
@@ -83,15 +88,17 @@ class Team:
         self._is_left = bool(value)
 
     def reset_roster(self):
-        self._roster = [Player.get_all_instances()[i] for i in self._default_starting_roster_ids]
-
-    def decide_substitution(self):
-        exiting_player = self.line_up[random.randint(0, NUM_OF_PLAYERS_IN_LINE_UP - 1)]
-        entering_player = self._roster[random.randint(NUM_OF_PLAYERS_IN_LINE_UP, NUM_OF_PLAYERS_IN_TEAM - 1)]
+        self._roster = [self._world.get_player(i) for i in self._default_starting_roster_ids]
+
+    def decide_substitution(self, rng=random) -> Tuple[Player, Player]:
+        """
+        :return: the entering player and the exiting player
+        """
+        exiting_player = self.line_up[rng.randint(0, NUM_OF_PLAYERS_IN_LINE_UP - 1)]
+        entering_player = self._roster[rng.randint(NUM_OF_PLAYERS_IN_LINE_UP, NUM_OF_PLAYERS_IN_TEAM - 1)]
         self.substitute(exiting_player, entering_player)
-        print(f"{entering_player.format_name} came on for {exiting_player.format_name} at position "
-              f"{exiting_player.position}")
         self.inhibit_substitution()
+        return entering_player, exiting_player
 
     def substitute(self, player1: Player, player2: Player):
         if not(player1 in self._roster and player2 in self._roster):
@@ -155,31 +162,36 @@ class Team:
             else:
                 player.get_off_field()
 
+    def reset_match_stats(self):
+        for player in self._roster:
+            player.reset_match_stats()
+
     def add_set_to_players_count(self):
         for player in self.line_up:
-            player.increment_stat_by("sets_played", 1)
+            player.start_set(self._is_left)
 
-    def get_positions(self):
-        positions = []
-        for player in self.line_up:
-            positions.append(tuple([player.row, player.column]))
-            if player.column not in range(22):
+    def _line_up_ids(self) -> List[int]:
+        return [player.get_id for player in self.line_up]
+
+    def _validate_columns(self, columns: List[int]):
+        for player, column in zip(self.line_up, columns):
+            if not 0 <= column < 22:
                 raise ValueError(f"{player.format_name} is in an invalid position. "
                                  f"row: {player.row}, col: {player.column}")
+
+    def get_positions(self):
+        positions = self._world.pool.positions(self._line_up_ids())
+        self._validate_columns([column for _, column in positions])
         return positions
 
     def get_columns(self):
-        columns = []
-        for player in self.line_up:
-            columns.append(player.column)
-            if player.column not in range(22):
-                raise ValueError(f"{player.format_name} is in an invalid position. "
-                                 f"row: {player.row}, col: {player.column}")
+        columns = self._world.pool.columns(self._line_up_ids())
+        self._validate_columns(columns)
         return columns
 
-    def advance_all(self):
+    def advance_all(self, rng=random):
         for player in self.line_up:
-            player.advance(self._is_left)
+            player.advance(self._is_left, rng)
 
     def trade_in_player(self, arriving_player: Player):
         self._default_starting_roster_ids.append(arriving_player.get_id)
@@ -0,0 +1,133 @@
+import json
+from collections import defaultdict
+from functools import wraps
+from time import perf_counter_ns
+from typing import Callable, Dict, Generator, List
+
+# the Game methods timed by StageTimer.instrument, and the stage names they are reported under
+GAME_STAGES = {
+    "simulate": "simulate",
+    "set": "set",
+    "_phase": "phase",
+    "_turn": "turn",
+    "_creating_competition": "creating_competition",
+    "dash_or_successful_pass": "dash_or_successful_pass",
+    "_face_offs": "face_offs"
+}
+# the Game decision step methods, generators that may wait for a human between their steps, and their stages
+GAME_STEP_STAGES = {
+    "_set_steps": "set",
+    "_phase_steps": "phase",
+    "_turn_steps": "turn",
+    "_face_off_steps": "face_offs"
+}
+
+
+def _percentile(sorted_values: List[int], percent: float) -> int:
+    index = max(0, min(len(sorted_values) - 1, round(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class StageTimer:
+    """
+    Times the stages of a match: call counts, cumulative time and latency percentiles per stage.
+
+    the timer wraps the methods of a single game instance, so a game without a timer runs its methods untouched.
+    the time of a stage includes the stages it calls (a set includes its phases, a phase its turns...). a stage
+    reached again from inside itself (the set steps of a Game call its set) is timed once, by the outer call, and a
+    decision step is timed only while it runs, not while it waits for an answer.
+    """
+
+    def __init__(self):
+        self._durations: Dict[str, List[int]] = defaultdict(list)  # nanoseconds of every call, by stage
+
+    def wrap(self, stage: str, function: Callable, depths: Dict[str, int] = None) -> Callable:
+        """
+        :param depths: dict of stage to the calls of it that are running, shared by the wrappers of one game, so a
+        nested call of a running stage is not timed again
+        """
+        durations = self._durations[stage]
+        depths = depths if depths is not None else defaultdict(int)
+
+        @wraps(function)
+        def timed(*args, **kwargs):
+            if depths[stage]:
+                return function(*args, **kwargs)
+            depths[stage] += 1
+            start = perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                durations.append(perf_counter_ns() - start)
+                depths[stage] -= 1
+        return timed
+
+    def wrap_steps(self, stage: str, function: Callable[..., Generator], depths: Dict[str, int] = None
+                   ) -> Callable[..., Generator]:
+        """wrap, for a function that returns a generator of decision steps. the waits at its yields are not timed."""
+        durations = self._durations[stage]
+        depths = depths if depths is not None else defaultdict(int)
+
+        @wraps(function)
+        def timed(*args, **kwargs):
+            if depths[stage]:
+                return (yield from function(*args, **kwargs))
+            depths[stage] += 1
+            elapsed = 0
+            start = perf_counter_ns()
+            try:
+                steps = function(*args, **kwargs)
+                request = next(steps)
+                while True:
+                    elapsed += perf_counter_ns() - start
+                    start = None
+                    answer = yield request
+                    start = perf_counter_ns()
+                    request = steps.send(answer)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                if start is not None:
+                    elapsed += perf_counter_ns() - start
+                durations.append(elapsed)
+                depths[stage] -= 1
+        return timed
+
+    def instrument(self, game):
+        """replaces the staged methods and decision steps of game (not of its class) by timed ones."""
+        depths = defaultdict(int)
+        for method_name, stage in GAME_STAGES.items():
+            setattr(game, method_name, self.wrap(stage, getattr(game, method_name), depths))
+        for method_name, stage in GAME_STEP_STAGES.items():
+            if hasattr(game, method_name):
+                setattr(game, method_name, self.wrap_steps(stage, getattr(game, method_name), depths))
+
+    def reset(self):
+        for durations in self._durations.values():
+            durations.clear()
+
+    def report(self) -> dict:
+        """
+        :return: dict of stage to its calls, total and mean seconds and p50/p90/p99/max latencies in seconds
+        """
+        result = {}
+        for stage, durations in self._durations.items():
+            if not durations:
+                continue
+            sorted_durations = sorted(durations)
+            total = sum(durations)
+            result[stage] = {
+                "calls": len(durations),
+                "total_seconds": total / 1e9,
+                "mean_seconds": total / len(durations) / 1e9,
+                "p50_seconds": _percentile(sorted_durations, 50) / 1e9,
+                "p90_seconds": _percentile(sorted_durations, 90) / 1e9,
+                "p99_seconds": _percentile(sorted_durations, 99) / 1e9,
+                "max_seconds": sorted_durations[-1] / 1e9
+            }
+        return result
+
+    def dump(self, path: str):
+        """writes the report to a JSON profile file."""
+        with open(path, "w") as file:
+            json.dump(self.report(), file, indent=2)
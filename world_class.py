@@ -0,0 +1,204 @@
+from threading import Lock, RLock
+from typing import Iterable, Union
+from weakref import WeakSet
+
+from numpy import array, int64
+
+import rating_logic
+from leaderboard_class import Leaderboard
+from pool_class import PlayerPool
+from stats_class import StatsStore, STAT_NAMES
+
+
+class World:
+    """
+    The players, teams and games of one simulation, with the stat counters and leaderboards of its players.
+
+    player and team ids are the indexes of the world's own lists, so two worlds (two leagues) can live side by side
+    in one process without seeing each other. the world holds its players and teams until it is cleared or closed,
+    its games are only tracked weakly, so a finished game and its field are freed as soon as the caller drops it.
+
+    adding players, teams and games is guarded by the world's lock, and so is a whole match (see Game.simulate),
+    so threads may share a world. the stat stores are not locked on their own.
+    """
+    _default = None  # Static world of everything built without a world of its own
+    _default_lock = Lock()
+
+    def __init__(self):
+        self._lock = RLock()
+        self._closed = False
+        self._game_counter = 0
+        self._reset()
+
+    def _reset(self):
+        self._pool = PlayerPool()
+        self._players: list = []
+        self._teams: list = []
+        self._games = WeakSet()
+        self._game_stats = StatsStore()  # counters of the current match, one row per player
+        self._season_stats = StatsStore()  # counters of the current season, one row per player
+        self._all_time_stats = StatsStore()  # counters of all matches, one row per player
+        self._season_leaders = Leaderboard(self._season_stats)  # top players of every season stat
+        self._all_time_leaders = Leaderboard(self._all_time_stats)  # top players of every all-time stat
+
+    @classmethod
+    def default(cls) -> "World":
+        """Class method to retrieve the shared world, created on first use."""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # Properties
+    @property
+    def lock(self) -> RLock:
+        return self._lock
+
+    @property
+    def closed(self):
+        return self._closed
+
+    @property
+    def pool(self) -> PlayerPool:
+        return self._pool
+
+    @property
+    def players(self) -> list:
+        return self._players
+
+    @property
+    def teams(self) -> list:
+        return self._teams
+
+    @property
+    def games(self) -> list:
+        """the games of this world that are still referenced somewhere"""
+        return list(self._games)
+
+    @property
+    def game_stats(self) -> StatsStore:
+        return self._game_stats
+
+    @property
+    def season_stats(self) -> StatsStore:
+        return self._season_stats
+
+    @property
+    def all_time_stats(self) -> StatsStore:
+        return self._all_time_stats
+
+    @property
+    def season_leaderboard(self) -> Leaderboard:
+        return self._season_leaders
+
+    @property
+    def all_time_leaderboard(self) -> Leaderboard:
+        return self._all_time_leaders
+
+    # registration
+    def _check_open(self):
+        if self._closed:
+            print("this world was closed, create a new one")
+            raise RuntimeError("closed world")
+
+    def add_player(self, player, record: dict) -> int:
+        """
+        stores a new player's attributes in the pool and gives it stat rows.
+
+        :return: the player's id
+        """
+        with self._lock:
+            self._check_open()
+            player_id = self._pool.add(record)
+            self._players.append(player)
+            for store in (self._game_stats, self._season_stats, self._all_time_stats):
+                store.ensure_capacity(player_id)
+            return player_id
+
+    def get_player(self, player_id: int):
+        try:
+            return self._players[player_id]
+        except IndexError:
+            print(f"there is no player with the id {player_id} in this world")
+            raise
+
+    def add_team(self, team) -> int:
+        """:return: the team's id"""
+        with self._lock:
+            self._check_open()
+            self._teams.append(team)
+            return len(self._teams) - 1
+
+    def add_game(self, game) -> int:
+        """:return: the game's id, counting from 1"""
+        with self._lock:
+            self._check_open()
+            self._games.add(game)
+            self._game_counter += 1
+            return self._game_counter
+
+    def clear(self):
+        """forgets every player, team and game, and every stat. players and teams that were kept must not be used."""
+        with self._lock:
+            for leaderboard in (self._season_leaders, self._all_time_leaders):
+                leaderboard.close()
+            self._game_counter = 0
+            self._reset()
+
+    def close(self):
+        """releases everything the world owns, nothing can be added to it afterwards."""
+        with self._lock:
+            self.clear()
+            self._closed = True
+            with World._default_lock:
+                if World._default is self:
+                    World._default = None
+
+    # stats
+    def roll_up_match_stats(self, player_ids: Iterable[int] = None):
+        """
+        folds the match counters of the given players (of every player when None) into their season and all-time
+        counters, and zeroes the match counters for the next match.
+        """
+        self._game_stats.roll_into((self._season_stats, self._all_time_stats), player_ids)
+
+    def roll_up_match_summary(self, player_stats: dict):
+        """
+        folds match stats that were counted elsewhere (another process) into the players' season and all-time
+        counters, the way roll_up_match_stats folds the local ones.
+
+        :param player_stats: dict of player id to a dict of stat to value, as in a match summary
+        """
+        rows = array([[stats[stat] for stat in STAT_NAMES] for stats in player_stats.values()], dtype=int64)
+        for store in (self._season_stats, self._all_time_stats):
+            store.add_rows(player_stats.keys(), rows)
+
+    def match_leaders(self, player_ids: Iterable[int]) -> dict:
+        """:return: dict of player id to the stats that player leads in the current match, see StatsStore.leaders"""
+        return self._game_stats.leaders(player_ids)
+
+    def rate_match(self, player_ids: Iterable[int]) -> dict:
+        """
+        rates the current match of many players at once.
+
+        :return: dict of player id to the standardized offence, defence, formation and fail scores, for the given
+        players that played a set
+        """
+        player_ids = [player_id for player_id in player_ids if self._game_stats.get(player_id, "sets_played")]
+        ratings = rating_logic.standardize(rating_logic.raw_scores(self._game_stats.values[player_ids]))
+        return {player_id: rating_logic.score_rows(ratings, i) for i, player_id in enumerate(player_ids)}
+
+    def reset_season_stats(self):
+        self._season_stats.clear_all()
+
+
+def resolve_world(world: Union[World, None]) -> World:
+    """:return: the given world, or the default one when None"""
+    return world if world is not None else World.default()
+